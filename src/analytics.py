@@ -0,0 +1,150 @@
+"""
+Price analytics for SaleNotificator.
+
+History-based alert rules on an item's tracked parameter:
+
+    {"new_low": 90}                        lowest value in 90 days
+    {"below_median": 10, "days": 30}       at least 10% below the 30-day median
+    {"volatility_spike": 3, "days": 30}    moves over the last day are 3x more
+                                           volatile than over the last 30 days
+
+Each item's past values are kept in memory as NumPy arrays. They are read
+from the price history once, then only extended with the checks recorded
+since the previous run and trimmed to the longest window the item's rules
+need, so evaluating the rules never rescans the full history.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from history import PriceHistory
+from settings import TrackedItem
+
+
+DAY = 86400.0
+
+
+def rule_days(rule: Dict) -> float:
+    """Length of a history rule's window in days."""
+    if 'new_low' in rule:
+        return float(rule['new_low'])
+    return float(rule.get('days', 30))
+
+
+class PriceSeries:
+    """Timestamps and values of one item's successful checks, oldest first."""
+
+    __slots__ = ('times', 'values', 'horizon', 'loaded_until')
+
+    def __init__(self, horizon: float, since: float):
+        self.times = np.empty(0)
+        self.values = np.empty(0)
+        self.horizon = horizon
+        self.loaded_until = since
+
+    def extend(self, rows: List[Tuple[float, float]]):
+        """Append rows returned by PriceHistory.series()."""
+        if rows:
+            block = np.asarray(rows, dtype=float)
+            self.times = np.concatenate((self.times, block[:, 0]))
+            self.values = np.concatenate((self.values, block[:, 1]))
+            self.loaded_until = self.times[-1]
+
+    def trim(self, since: float):
+        """Drop samples older than 'since'."""
+        start = np.searchsorted(self.times, since)
+        if start:
+            # Copy, so the old arrays can actually be freed
+            self.times = self.times[start:].copy()
+            self.values = self.values[start:].copy()
+
+    def window(self, since: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (times, values) of samples after 'since' as views."""
+        start = np.searchsorted(self.times, since, side='right')
+        return self.times[start:], self.values[start:]
+
+
+class PriceAnalytics:
+    """Evaluates history-based alert rules from in-memory price series."""
+
+    def __init__(self, history: PriceHistory, min_samples: int = 10):
+        self.history = history
+        self.min_samples = min_samples
+        self._series: Dict[str, PriceSeries] = {}
+
+    def series(self, key: str, horizon: float, now: float) -> PriceSeries:
+        """Return an item's series covering 'horizon' seconds, loading only new rows."""
+        series = self._series.get(key)
+        if series is None or horizon > series.horizon:
+            series = self._series[key] = PriceSeries(horizon, now - horizon)
+
+        series.extend(self.history.series(key, since=series.loaded_until))
+        series.trim(now - horizon)
+        return series
+
+    def check(self, item: TrackedItem, value: float, now: float) -> List[str]:
+        """
+        Return the conditions triggered by a newly checked value.
+
+        Must be called before the value itself is recorded in the history.
+        """
+        rules = item.history_rules
+        if not rules:
+            return []
+
+        horizon = max(rule_days(rule) for rule in rules) * DAY
+        series = self.series(item.key, horizon, now)
+
+        conditions = []
+        for rule in rules:
+            days = rule_days(rule)
+            times, values = series.window(now - days * DAY)
+            if values.size < self.min_samples:
+                continue
+
+            if 'new_low' in rule:
+                low = values.min()
+                if value < low:
+                    conditions.append(f"new {days:g}-day low (previous low {low:,.2f})")
+
+            if 'below_median' in rule:
+                median = np.median(values)
+                if value <= median * (1 - rule['below_median'] / 100):
+                    conditions.append(
+                        f"{rule['below_median']:g}% or more below {days:g}-day median {median:,.2f}"
+                    )
+
+            if 'volatility_spike' in rule:
+                condition = self._volatility_spike(rule, days, times, values, value, now)
+                if condition:
+                    conditions.append(condition)
+
+        return conditions
+
+    def _volatility_spike(self, rule: Dict, days: float, times: np.ndarray,
+                          values: np.ndarray, value: float, now: float) -> str:
+        """Compare the spread of recent price moves with the window's baseline."""
+        recent_since = now - rule.get('recent_hours', 24) * 3600
+        prices = np.append(values, value)
+        positive = prices > 0
+        if not positive.all():
+            return ''
+
+        returns = np.diff(np.log(prices))
+        # Each return is dated by the later of its two samples
+        return_times = np.append(times[1:], now)
+        recent = return_times > recent_since
+
+        baseline = returns[~recent]
+        if baseline.size < self.min_samples or recent.sum() < 2:
+            return ''
+
+        baseline_std = baseline.std()
+        recent_std = returns[recent].std()
+        if baseline_std > 0 and recent_std > rule['volatility_spike'] * baseline_std:
+            return (
+                f"volatility spike ({recent_std / baseline_std:.1f}x the "
+                f"{days:g}-day level)"
+            )
+        return ''
@@ -0,0 +1,147 @@
+"""
+Price history storage for SaleNotificator.
+
+Every check of every item is appended to a small SQLite database, so runs
+can be planned from past results (recent prices, last success) instead of
+starting from scratch each time. Each check is committed as soon as it is
+made and tagged with its run, so a run cut short by a crash or redeploy
+can be resumed where it stopped. Runs belong to an instance, so sharded
+instances sharing one database only resume and finish their own.
+"""
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class ItemSummary:
+    """Recent history of one item."""
+    last_value: Optional[float] = None
+    last_success: Optional[float] = None
+    last_check: Optional[float] = None
+    recent_values: List[float] = field(default_factory=list)
+
+
+class PriceHistory:
+    """Append-only log of check results in SQLite."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS checks ('
+                ' item_key TEXT NOT NULL,'
+                ' checked_at REAL NOT NULL,'
+                ' value REAL,'
+                ' ok INTEGER NOT NULL)'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS checks_item_time ON checks (item_key, checked_at)'
+            )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS runs ('
+                ' id INTEGER PRIMARY KEY,'
+                ' started_at REAL NOT NULL,'
+                ' finished_at REAL)'
+            )
+            # Databases created before run checkpoints lack these columns
+            columns = {row[1] for row in self._conn.execute('PRAGMA table_info(checks)')}
+            if 'run_id' not in columns:
+                self._conn.execute('ALTER TABLE checks ADD COLUMN run_id INTEGER')
+            if 'alerts' not in columns:
+                self._conn.execute('ALTER TABLE checks ADD COLUMN alerts TEXT')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS checks_run ON checks (run_id)')
+            # ...and runs before sharded instances shared a database
+            columns = {row[1] for row in self._conn.execute('PRAGMA table_info(runs)')}
+            if 'instance' not in columns:
+                self._conn.execute("ALTER TABLE runs ADD COLUMN instance TEXT NOT NULL DEFAULT ''")
+
+    def record(self, key: str, checked_at: float, value: Optional[float], ok: bool,
+               run_id: Optional[int] = None, alerts: Optional[List[Dict]] = None):
+        """Append one check result; value is None when the check failed."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT INTO checks (item_key, checked_at, value, ok, run_id, alerts)'
+                ' VALUES (?, ?, ?, ?, ?, ?)',
+                (key, checked_at, value, int(ok), run_id, json.dumps(alerts or []))
+            )
+
+    def start_run(self, started_at: float, instance: str = '') -> int:
+        """Open a new run of an instance and return its id."""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                'INSERT INTO runs (started_at, instance) VALUES (?, ?)', (started_at, instance)
+            ).lastrowid
+
+    def finish_run(self, run_id: int, finished_at: float):
+        """Mark a run as complete; it will no longer be resumed."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'UPDATE runs SET finished_at = ? WHERE id = ?', (finished_at, run_id)
+            )
+
+    def unfinished_run(self, instance: str = '') -> Optional[Tuple[int, float]]:
+        """Return (run_id, started_at) of an instance's latest run if it never finished."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT id, started_at, finished_at FROM runs WHERE instance = ?'
+                ' ORDER BY id DESC LIMIT 1', (instance,)
+            ).fetchone()
+        if row is None or row[2] is not None:
+            return None
+        return row[0], row[1]
+
+    def run_checks(self, run_id: int, since: float = 0.0) -> Dict[str, List[Dict]]:
+        """Return the alerts of every item checked in a run after 'since', by item key."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT item_key, alerts FROM checks WHERE run_id = ? AND checked_at > ?',
+                (run_id, since)
+            ).fetchall()
+        return {key: json.loads(alerts or '[]') for key, alerts in rows}
+
+    def summaries(self, keys: Iterable[str], window: int = 10) -> Dict[str, ItemSummary]:
+        """Return the last check, last success and recent values for each key."""
+        summaries = {}
+        with self._lock:
+            for key in keys:
+                summary = ItemSummary()
+                summary.last_check, summary.last_success = self._conn.execute(
+                    'SELECT MAX(checked_at), MAX(CASE WHEN ok = 1 THEN checked_at END)'
+                    ' FROM checks WHERE item_key = ?', (key,)
+                ).fetchone()
+                # Items tracking a text field succeed without a number
+                rows = self._conn.execute(
+                    'SELECT value FROM checks'
+                    ' WHERE item_key = ? AND ok = 1 AND value IS NOT NULL'
+                    ' ORDER BY checked_at DESC LIMIT ?',
+                    (key, window)
+                ).fetchall()
+                if rows:
+                    summary.last_value = rows[0][0]
+                    summary.recent_values = [value for value, in reversed(rows)]
+                summaries[key] = summary
+        return summaries
+
+    def series(self, key: str, since: float = 0.0) -> List[Tuple[float, float]]:
+        """Return (checked_at, value) of successful checks after 'since', oldest first."""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT checked_at, value FROM checks'
+                ' WHERE item_key = ? AND ok = 1 AND value IS NOT NULL AND checked_at > ?'
+                ' ORDER BY checked_at',
+                (key, since)
+            ).fetchall()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Bulk item importer.
+
+Reads a CSV or JSONL file of product URLs, fetches the pages concurrently
+(rate limited per host), tries a library of candidate price selectors on
+each page and prints ready-to-use `tracked_items` entries for config.json.
+
+Usage:
+    python src/importer.py urls.csv [-o items.json] [--workers 4] [--samples 2]
+
+Input columns / keys: url (required), name, threshold, currency,
+expected_price. When no threshold is given it defaults to
+--threshold-percent below the current price.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Optional, Tuple
+
+from scraper import PriceScraper, ScraperError
+
+
+# Candidate selectors, roughly from most to least specific.
+# (selector, description)
+CANDIDATE_SELECTORS = [
+    # Structured data
+    ('script[type="application/ld+json"]', 'JSON-LD offer'),
+    ('meta[itemprop="price"]', 'Microdata price'),
+    ('meta[property="product:price:amount"]', 'OpenGraph price'),
+    ('meta[property="og:price:amount"]', 'OpenGraph price (legacy)'),
+    ('[itemprop="price"]', 'Microdata price element'),
+
+    # Amazon
+    ('#corePriceDisplay_desktop_feature_div .a-price .a-offscreen', 'Amazon core price display'),
+    ('#apex_desktop .a-price .a-offscreen', 'Amazon apex desktop price'),
+    ('span.a-price[data-a-color="price"] .a-offscreen', 'Amazon main colored price'),
+    ('#buybox .a-price .a-offscreen', 'Amazon buy box price'),
+    ('.a-price .a-offscreen', 'Amazon first offscreen price'),
+
+    # Generic shop markup
+    ('[data-price]', 'data-price attribute'),
+    ('.price-now', 'Current price'),
+    ('.product-price', 'Product price'),
+    ('.our-price', 'Our price'),
+    ('.sale-price', 'Sale price'),
+    ('.price', 'Generic price'),
+]
+
+# Evaluations per candidate when timing selectors
+TIMING_ROUNDS = 5
+
+
+def read_input(path: Path) -> List[Dict]:
+    """Read product rows from a CSV or JSONL file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix.lower() in ('.jsonl', '.ndjson'):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+
+    return [row for row in rows if row.get('url')]
+
+
+def time_candidate(scraper: PriceScraper, soup, selector: str) -> Tuple[Optional[float], float]:
+    """Return the price a selector extracts and its median evaluation time."""
+    price = None
+    timings = []
+    for _ in range(TIMING_ROUNDS):
+        start = time.perf_counter()
+        price = scraper.select_price(soup, selector, script_fallback=False)
+        timings.append(time.perf_counter() - start)
+
+    return price, median(timings)
+
+
+def page_title(soup) -> Optional[str]:
+    """Return a product name from OpenGraph or the page title."""
+    og_title = soup.select_one('meta[property="og:title"]')
+    if og_title and og_title.get('content'):
+        return og_title['content'].strip()
+    if soup.title and soup.title.string:
+        return soup.title.string.strip()
+    return None
+
+
+def evaluate_url(scraper: PriceScraper, row: Dict, samples: int) -> Dict:
+    """
+    Fetch a URL one or more times and pick its best selector.
+
+    A candidate qualifies when it returns the reference price in every
+    sample. The reference is the expected_price column when given, else the
+    JSON-LD offer price, else the most common candidate result. Among the
+    qualifying candidates the fastest one wins.
+    """
+    url = row['url']
+    results: Dict[str, List[Optional[float]]] = {selector: [] for selector, _ in CANDIDATE_SELECTORS}
+    timings: Dict[str, float] = {}
+    name = row.get('name')
+
+    for sample in range(samples):
+        content, encoding = scraper.fetch_content(url)
+        soup = scraper.parse(content, encoding)
+        name = name or page_title(soup)
+
+        for selector, _ in CANDIDATE_SELECTORS:
+            # Timing once is enough; later samples only check stability
+            if sample == 0:
+                price, timings[selector] = time_candidate(scraper, soup, selector)
+            else:
+                price = scraper.select_price(soup, selector, script_fallback=False)
+            results[selector].append(price)
+
+    # Only selectors that returned the same price in every sample are stable
+    stable = {
+        selector: prices[0]
+        for selector, prices in results.items()
+        if prices[0] is not None and len(set(prices)) == 1
+    }
+
+    if row.get('expected_price'):
+        reference = float(row['expected_price'])
+    elif 'script[type="application/ld+json"]' in stable:
+        reference = stable['script[type="application/ld+json"]']
+    elif stable:
+        reference = Counter(stable.values()).most_common(1)[0][0]
+    else:
+        raise ScraperError(f"No candidate selector found a stable price on {url}")
+
+    matching = [selector for selector, price in stable.items() if price == reference]
+    if not matching:
+        raise ScraperError(f"No candidate selector returned {reference:,.2f} on {url}")
+
+    best = min(matching, key=timings.get)
+
+    return {
+        'url': url,
+        'name': name or url,
+        'price': reference,
+        'selector': best,
+        'elapsed': timings[best],
+    }
+
+
+def build_item(row: Dict, result: Dict, threshold_percent: float, currency: str) -> Dict:
+    """Build a tracked_items entry from an input row and its evaluation."""
+    if row.get('threshold'):
+        threshold = float(row['threshold'])
+    else:
+        threshold = round(result['price'] * (1 - threshold_percent / 100), 2)
+
+    return {
+        'name': result['name'],
+        'url': result['url'],
+        'parameter': 'price',
+        'css_selector': result['selector'],
+        'threshold': threshold,
+        'currency': row.get('currency') or currency,
+        'enabled': True
+    }
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Resolve price selectors for many product URLs at once.'
+    )
+    parser.add_argument('input', type=Path, help='CSV or JSONL file with a "url" column')
+    parser.add_argument('-o', '--output', type=Path, help='Write the items JSON here instead of stdout')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent fetches (default: 4)')
+    parser.add_argument('--delay', type=float, default=2.0, help='Seconds between requests to one host (default: 2)')
+    parser.add_argument('--samples', type=int, default=2, help='Fetches per URL to check stability (default: 2)')
+    parser.add_argument('--threshold-percent', type=float, default=10.0,
+                        help='Default threshold below the current price, in percent (default: 10)')
+    parser.add_argument('--currency', default='', help='Default currency code')
+    args = parser.parse_args()
+
+    rows = read_input(args.input)
+    if not rows:
+        print(f"No URLs found in {args.input}", file=sys.stderr)
+        return 1
+
+    scraper = PriceScraper(delay=args.delay, pool_maxsize=args.workers)
+    items: Dict[int, Dict] = {}
+    failures = 0
+
+    print(f"Resolving selectors for {len(rows)} URL(s) with {args.workers} worker(s)...", file=sys.stderr)
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(evaluate_url, scraper, row, args.samples): index
+            for index, row in enumerate(rows)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            row = rows[index]
+            try:
+                result = future.result()
+            except (ScraperError, ValueError) as e:
+                failures += 1
+                print(f"✗ {row['url']}: {e}", file=sys.stderr)
+                continue
+
+            items[index] = build_item(row, result, args.threshold_percent, args.currency)
+            print(
+                f"✓ {row['url']}: {result['price']:,.2f} via \"{result['selector']}\" "
+                f"({result['elapsed'] * 1000:.2f} ms)",
+                file=sys.stderr
+            )
+
+    scraper.close()
+
+    # Keep the input order in the output
+    output = json.dumps(
+        {'tracked_items': [items[index] for index in sorted(items)]},
+        indent=2,
+        ensure_ascii=False
+    )
+    if args.output:
+        args.output.write_text(output + '\n', encoding='utf-8')
+        print(f"Wrote {len(items)} item(s) to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    print(f"Resolved {len(items)} of {len(rows)} URL(s), {failures} failed", file=sys.stderr)
+    return 0 if items else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
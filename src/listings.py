@@ -0,0 +1,95 @@
+"""
+Listing-page sources for SaleNotificator.
+
+A listing source is a category, search or wishlist page that shows many
+products at once. One fetch and one parse of that page can update every
+tracked item found on it, matched by SKU or by product URL. Items that are
+missing from all listings are fetched from their own product page.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from prices import resolve_locale
+from scraper import PriceScraper, ScraperError, normalize_fields
+from settings import TrackedItem
+
+
+class ListingIndex:
+    """Rows from all listing pages of a run, indexed by SKU and product URL."""
+
+    def __init__(self):
+        self.by_sku: Dict[str, Dict] = {}
+        self.by_url: Dict[str, Dict] = {}
+
+    def add(self, row: Dict):
+        """Index a listing row; the first row seen for a key wins."""
+        if row['sku']:
+            self.by_sku.setdefault(row['sku'].lower(), row)
+        if row['url']:
+            self.by_url.setdefault(row['url'], row)
+
+    def match(self, item: TrackedItem) -> Optional[Dict]:
+        """
+        Return the field values for an item, or None if a listing can't serve it.
+
+        The item must be found by 'sku' or URL, and the listing row must
+        provide every field the item needs, including a value for its
+        tracked parameter.
+        """
+        row = None
+        if item.sku:
+            row = self.by_sku.get(item.sku.lower())
+        if row is None:
+            row = self.by_url.get(item.page_url)
+        if row is None:
+            return None
+
+        values = row['fields']
+        if not item.fields.keys() <= values.keys():
+            return None
+        if values.get(item.parameter) is None:
+            return None
+
+        return {name: values[name] for name in item.fields}
+
+
+def load_listings(scraper: PriceScraper, sources: List[Dict],
+                  logger: logging.Logger) -> ListingIndex:
+    """Fetch every enabled listing source once and index its product rows."""
+    index = ListingIndex()
+
+    for source in sources:
+        name = source.get('name', source['url'])
+        if not source.get('enabled', True):
+            logger.info(f"Skipping disabled listing: {name}")
+            continue
+
+        fields = normalize_fields(source.get('fields', {'price': source.get('price_selector', '.price')}))
+        locale = resolve_locale(source.get('locale'), source.get('currency'))
+        for spec in fields.values():
+            if spec['type'] == 'number':
+                spec.setdefault('locale', locale)
+
+        try:
+            rows = scraper.get_listing_rows(
+                source['url'],
+                source['row_selector'],
+                fields,
+                link_selector=source.get('link_selector', 'a[href]'),
+                sku_selector=source.get('sku_selector'),
+                sku_attribute=source.get('sku_attribute'),
+                render=source.get('render', False)
+            )
+        except ScraperError as e:
+            logger.error(f"ERROR: Listing {name} | Failed to scrape: {e}")
+            continue
+        except Exception as e:
+            logger.error(f"ERROR: Listing {name} | Unexpected error: {e}")
+            continue
+
+        for row in rows:
+            index.add(row)
+        logger.info(f"LISTING: {name} | {len(rows)} product row(s)")
+
+    return index
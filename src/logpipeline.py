@@ -0,0 +1,155 @@
+"""
+Logging pipeline for SaleNotificator.
+
+Log calls only put the record on an in-memory queue; a background listener
+thread formats the records and writes them out, so slow disks never hold
+up scraping. Two files are written side by side:
+
+- price_checks_YYYY-MM.log: the human-readable lines, as on the console
+- price_checks_YYYY-MM.jsonl: one JSON object per record, including one
+  record per checked item with its host, value, timing and outcome
+
+Within a month both files rotate by size (or by time), and rotated files
+are gzip-compressed by the listener thread.
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Logger for the structured per-item records; kept out of the human logs
+CHECKS_LOGGER = 'SaleNotificator.checks'
+
+# Record attributes copied into JSON lines when present
+STRUCTURED_FIELDS = (
+    'item', 'url', 'host', 'parameter', 'value', 'threshold', 'currency',
+    'outcome', 'elapsed_ms', 'run_id',
+)
+
+HUMAN_FORMAT = '%(asctime)s | %(levelname)s | %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Active listener and the settings it was built with
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_settings: Optional[Tuple[Path, Dict]] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for name in STRUCTURED_FIELDS:
+            if hasattr(record, name):
+                data[name] = getattr(record, name)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class HumanFilter(logging.Filter):
+    """Drop the structured per-item records from human-readable outputs."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.name != CHECKS_LOGGER
+
+
+def _gzip_rotator(source: str, dest: str):
+    """Compress a rotated log file instead of just renaming it."""
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def _gzip_namer(name: str) -> str:
+    return name + '.gz'
+
+
+def _file_handler(path: Path, logging_config: Dict) -> logging.Handler:
+    """Create a size- or time-rotating file handler for one log file."""
+    backup_count = logging_config.get('backup_count', 5)
+
+    if logging_config.get('when'):
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=logging_config['when'], backupCount=backup_count, encoding='utf-8'
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=logging_config.get('max_bytes', 10 * 1024 * 1024),
+            backupCount=backup_count, encoding='utf-8'
+        )
+
+    if logging_config.get('compress', True):
+        handler.rotator = _gzip_rotator
+        handler.namer = _gzip_namer
+
+    return handler
+
+
+def start_logging(log_file: Path, logging_config: Dict) -> logging.Logger:
+    """
+    Route the 'SaleNotificator' logger through a queue to its outputs.
+
+    Safe to call before every run: the pipeline is only rebuilt when the
+    log file (e.g. a new month) or the logging settings change.
+    """
+    global _listener, _listener_settings
+
+    logger = logging.getLogger('SaleNotificator')
+    settings = (log_file, logging_config)
+    if _listener is not None and settings == _listener_settings:
+        return logger
+
+    stop_logging()
+    log_file.parent.mkdir(exist_ok=True)
+
+    human_formatter = logging.Formatter(HUMAN_FORMAT, datefmt=DATE_FORMAT)
+    handlers = [logging.StreamHandler(), _file_handler(log_file, logging_config)]
+    for handler in handlers:
+        handler.setFormatter(human_formatter)
+        handler.addFilter(HumanFilter())
+
+    if logging_config.get('json', True):
+        json_handler = _file_handler(log_file.with_suffix('.jsonl'), logging_config)
+        json_handler.setFormatter(JsonFormatter())
+        handlers.append(json_handler)
+
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    # Console output is ours; don't repeat it through the root logger
+    logger.propagate = False
+
+    _listener_settings = settings
+    return logger
+
+
+def stop_logging():
+    """Write out every queued record and stop the listener thread."""
+    global _listener, _listener_settings
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        _listener_settings = None
+
+
+atexit.register(stop_logging)
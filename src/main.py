@@ -10,21 +10,50 @@ import json
 import logging
 import os
 import sys
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from croniter import croniter
 
 from scraper import PriceScraper, ScraperError
+from renderer import create_renderer
+from listings import load_listings
+from parsing import ParsePool, extract_in_worker
+from sharding import get_coordinator
+from history import PriceHistory
+from planner import plan_run
+from analytics import PriceAnalytics
+from logpipeline import CHECKS_LOGGER, start_logging
+from settings import BASE_DIR, ConfigError, TrackedItem, load_settings
+import status
 from notifier import EmailNotifier, NotifierError
 
 
 # Paths
-BASE_DIR = Path(__file__).parent.parent
-CONFIG_DIR = BASE_DIR / 'config'
 LOGS_DIR = BASE_DIR / 'logs'
+DATA_DIR = BASE_DIR / 'data'
+
+# Price history database
+HISTORY_FILE = DATA_DIR / 'history.db'
+
+# Scraper kept alive between runs so connections to retailers are reused
+_scraper: Optional[PriceScraper] = None
+_scraper_settings: Optional[Dict] = None
+
+# Parser worker pool, also kept alive between runs
+_parse_pool: Optional[ParsePool] = None
+_parse_pool_settings: Optional[Dict] = None
 
-# Config file
-CONFIG_FILE = CONFIG_DIR / 'config.json'
+# Price history, opened once per process
+_history: Optional[PriceHistory] = None
+
+# In-memory price series for history-based alert rules
+_analytics: Optional[PriceAnalytics] = None
 
 
 def get_monthly_log_file() -> Path:
@@ -36,114 +65,524 @@ def get_monthly_log_file() -> Path:
 
 
 def setup_logging() -> logging.Logger:
-    """Set up logging to both file and console."""
-    LOGS_DIR.mkdir(exist_ok=True)
+    """
+    Set up logging to the console and the monthly log files.
 
-    logger = logging.getLogger('SaleNotificator')
-    logger.setLevel(logging.INFO)
+    Records are written by a background thread (see logpipeline.py), with
+    a JSON-lines file next to the human-readable one.
+    """
+    try:
+        logging_config = load_settings().logging
+    except Exception:
+        # Config problems are reported by the run itself
+        logging_config = {}
 
-    # File handler with monthly log rotation
-    log_file = get_monthly_log_file()
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.INFO)
+    return start_logging(get_monthly_log_file(), logging_config)
 
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
 
-    # Formatter
-    formatter = logging.Formatter(
-        '%(asctime)s | %(levelname)s | %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
+def get_scraper(scraper_config: Dict) -> PriceScraper:
+    """
+    Return the shared PriceScraper, creating it on first use.
 
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    The scraper (and its connection pools) lives as long as the process, so
+    the scheduler daemon reuses keep-alive connections across runs. It is
+    only rebuilt when the scraper settings change.
+    """
+    global _scraper, _scraper_settings
+
+    if _scraper is None or scraper_config != _scraper_settings:
+        if _scraper is not None:
+            _scraper.close()
+        _scraper = PriceScraper(
+            stream=scraper_config.get('stream', False),
+            max_body_bytes=scraper_config.get('max_body_bytes', 5 * 1024 * 1024),
+            pool_connections=scraper_config.get('pool_connections', 10),
+            pool_maxsize=scraper_config.get('pool_maxsize', 10),
+            pool_block=scraper_config.get('pool_block', False),
+            host_pools=scraper_config.get('host_pools', {}),
+            http2=scraper_config.get('http2', False),
+            proxies=scraper_config.get('proxies')
+        )
+        _scraper_settings = scraper_config
 
-    return logger
+    return _scraper
 
 
-def load_json_config(path: Path) -> Dict:
-    """Load a JSON configuration file."""
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+def get_parse_pool(parsing_config: Dict) -> Optional[ParsePool]:
+    """
+    Return the shared parser process pool, or None when parsing in-process.
+
+    The pool is enabled by setting 'parsing.processes' above zero and is
+    rebuilt when the parsing settings change.
+    """
+    global _parse_pool, _parse_pool_settings
+
+    if parsing_config != _parse_pool_settings:
+        if _parse_pool is not None:
+            _parse_pool.close()
+            _parse_pool = None
+        if parsing_config.get('processes', 0) > 0:
+            _parse_pool = ParsePool(
+                processes=parsing_config['processes'],
+                max_tasks_per_child=parsing_config.get('max_tasks_per_child', 20)
+            )
+        _parse_pool_settings = parsing_config
+
+    return _parse_pool
+
+
+def get_history() -> PriceHistory:
+    """Return the shared price history, opening it on first use."""
+    global _history
+
+    if _history is None:
+        _history = PriceHistory(HISTORY_FILE)
+
+    return _history
 
 
-def load_config() -> Dict:
+def get_analytics() -> PriceAnalytics:
+    """Return the shared price analytics, kept in memory between runs."""
+    global _analytics
+
+    if _analytics is None:
+        _analytics = PriceAnalytics(get_history())
+
+    return _analytics
+
+
+def get_run_budget(schedule_config: Dict) -> Optional[float]:
     """
-    Load configuration from config.json.
+    Return the time budget of a run in seconds, or None for no limit.
 
-    Returns a dict with keys: 'email', 'tracked_items', 'schedule' (if available)
+    'schedule.max_run_seconds' is either a number or "auto", which uses
+    the time left until the next cron tick minus a one-minute margin.
     """
-    if not CONFIG_FILE.exists():
-        raise FileNotFoundError(
-            f"Configuration file not found: {CONFIG_FILE}\n"
-            f"Please create config.json based on config.example.json"
+    budget = schedule_config.get('max_run_seconds')
+    if budget is None:
+        return None
+    if budget == 'auto':
+        now = datetime.now()
+        next_run = croniter(schedule_config.get('cron', '0 * * * *'), now).get_next(datetime)
+        return max((next_run - now).total_seconds() - 60, 60)
+    return float(budget)
+
+
+def group_by_page(items: List[TrackedItem]) -> Dict[Tuple[str, bool], List[TrackedItem]]:
+    """
+    Group items by normalised URL so each page is fetched and parsed once.
+
+    Rendered and plain fetches of the same URL are kept apart. Groups keep
+    the order in which their first item appears in the config.
+    """
+    pages: Dict[Tuple[str, bool], List[TrackedItem]] = {}
+    for item in items:
+        key = (item.page_url, item.render)
+        pages.setdefault(key, []).append(item)
+    return pages
+
+
+# Alert rule operators: (test, description); see settings.FIELD_RULES
+RULE_OPERATORS = {
+    'below': (lambda value, target: isinstance(value, float) and value < target, 'below'),
+    'above': (lambda value, target: isinstance(value, float) and value > target, 'above'),
+    'equals': (lambda value, target: value == target, 'equals'),
+    'contains': (lambda value, target: str(target).lower() in str(value).lower(), 'contains'),
+    'not_contains': (lambda value, target: str(target).lower() not in str(value).lower(), 'does not contain'),
+}
+
+
+def format_value(value) -> str:
+    """Format an extracted field value for logs and emails."""
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    return str(value)
+
+
+def condition_alert(item: TrackedItem, field: str, value, condition: str, values: Dict,
+                    logger: logging.Logger) -> Dict:
+    """Log and build an alert for a triggered rule."""
+    logger.info(f"ALERT: {item.name} | {field}: {format_value(value)} ({condition})")
+    return {
+        'name': item.name,
+        'url': item.url,
+        'parameter': field,
+        'value': value,
+        'condition': condition,
+        'currency': item.currency,
+        'fields': values
+    }
+
+
+def evaluate_item(item: TrackedItem, values: Dict, logger: logging.Logger) -> List[Dict]:
+    """
+    Check an item's extracted fields against its threshold and alert rules.
+
+    The tracked 'parameter' field is compared with 'threshold'; every rule
+    in 'alerts' ({"field": ..., "below"|"above"|"equals"|"contains"|
+    "not_contains": ...}) is checked against its field. Returns the alerts.
+    """
+    name = item.name
+    url = item.url
+    threshold = item.threshold
+    currency = item.currency
+    parameter = item.parameter
+    current_price = values.get(parameter)
+    alerts = []
+
+    if current_price is None:
+        logger.error(f"ERROR: {name} | Failed to scrape: Could not extract {parameter} from {url}")
+        return alerts
+
+    extras = ''.join(
+        f" | {field}: {format_value(value) if value is not None else 'not found'}"
+        for field, value in values.items() if field != parameter
+    )
+
+    if threshold is not None and current_price < threshold:
+        logger.info(
+            f"ALERT: {name} | {parameter}: {current_price:,.2f} {currency} "
+            f"(below threshold: {threshold:,.2f} {currency}){extras}"
+        )
+        alerts.append({
+            'name': name,
+            'url': url,
+            'current_price': current_price,
+            'threshold': threshold,
+            'currency': currency,
+            'parameter': parameter,
+            'fields': values
+        })
+    elif threshold is not None:
+        logger.info(
+            f"OK: {name} | {parameter}: {current_price:,.2f} {currency} "
+            f"(threshold: {threshold:,.2f} {currency}){extras}"
         )
+    else:
+        logger.info(f"OK: {name} | {parameter}: {format_value(current_price)} {currency}{extras}")
+
+    for rule in item.rules:
+        field = rule.get('field', parameter)
+        value = values.get(field)
+        if value is None:
+            continue
+
+        for operator, (test, description) in RULE_OPERATORS.items():
+            if operator in rule and test(value, rule[operator]):
+                condition = f"{field} {description} {format_value(rule[operator])}"
+                alerts.append(condition_alert(item, field, value, condition, values, logger))
+
+    return alerts
+
+
+def finish_item(item: TrackedItem, values: Optional[Dict], logger: logging.Logger,
+                history: PriceHistory, run_id: int,
+                elapsed: Optional[float] = None) -> List[Dict]:
+    """
+    Evaluate a checked item and checkpoint the result in the price history.
+
+    'values' is None when the item's page could not be fetched or parsed;
+    the caller has already logged why. 'elapsed' is the time spent on the
+    item's page, when it had one. Returns the item's alerts.
+
+    An error while evaluating the item is logged and the item recorded as
+    failed, so one bad item cannot abort the run.
+    """
+    parameter = item.parameter
+    value = values.get(parameter) if values is not None else None
+    number = value if isinstance(value, float) else None
+    checked_at = time.time()
+
+    try:
+        alerts = evaluate_item(item, values, logger) if values is not None else []
 
-    config = load_json_config(CONFIG_FILE)
+        # History rules compare against past values, so run them before recording
+        if number is not None:
+            for condition in get_analytics().check(item, number, checked_at):
+                alerts.append(condition_alert(item, parameter, number, condition, values, logger))
+    except Exception as e:
+        logger.error(f"ERROR: {item.name} | Unexpected error: {e}")
+        alerts = []
+        value = number = None
+
+    outcome = 'failed' if value is None else 'alert' if alerts else 'ok'
+
+    history.record(item.key, checked_at, number, value is not None,
+                   run_id=run_id, alerts=alerts)
+    status.record_check(item, number, value is not None, outcome, checked_at)
+
+    logging.getLogger(CHECKS_LOGGER).info(
+        f"CHECKED: {item.name} | {outcome}",
+        extra={
+            'item': item.name,
+            'url': item.url,
+            'host': item.host,
+            'parameter': parameter,
+            'value': value,
+            'threshold': item.threshold,
+            'currency': item.currency,
+            'outcome': outcome,
+            'elapsed_ms': round(elapsed * 1000) if elapsed is not None else None,
+            'run_id': run_id,
+        }
+    )
 
-    # Ensure tracked_items is a list
-    if 'tracked_items' not in config:
-        config['tracked_items'] = []
+    return alerts
 
-    return config
 
+def collect_parsed(page_items: List[TrackedItem], future: Future, started: float, job: Tuple,
+                   logger: logging.Logger, history: PriceHistory, run_id: int) -> List[Dict]:
+    """
+    Wait for a page parsed by the worker pool and evaluate its items.
 
-def check_prices(logger: logging.Logger) -> List[Dict]:
-    """Check all tracked items and return those below threshold."""
-    # Load configuration
-    config = load_config()
-    items = config.get('tracked_items', [])
+    'job' holds the (body, encoding, field sets) submitted to the pool, so
+    the page can still be parsed here if a worker died.
+    """
+    try:
+        try:
+            parsed = future.result()
+        except BrokenProcessPool:
+            logger.warning(f"PARSER: worker pool broke; parsing {page_items[0].url} in-process")
+            parsed = extract_in_worker(*job)
+    except Exception as e:
+        alerts = []
+        for item in page_items:
+            logger.error(f"ERROR: {item.name} | Failed to parse: {e}")
+            alerts.extend(finish_item(item, None, logger, history, run_id, time.perf_counter() - started))
+        return alerts
+
+    logger.debug(
+        f"PARSED: {page_items[0].url} | parse {parsed['parse_seconds'] * 1000:.0f} ms | "
+        f"extract {parsed['extract_seconds'] * 1000:.0f} ms"
+    )
 
-    scraper = PriceScraper()
+    elapsed = time.perf_counter() - started
     alerts = []
+    for item, values in zip(page_items, parsed['results']):
+        alerts.extend(finish_item(item, values, logger, history, run_id, elapsed))
+    return alerts
+
+
+def check_prices(logger: logging.Logger, startup: bool = False) -> List[Dict]:
+    """
+    Check all tracked items and return those below threshold.
+
+    Items are checked in priority order (see planner.py). When the run has
+    a time budget, pages not started before it runs out are deferred to
+    the next run.
+
+    Every result is checkpointed as it comes in. If the previous run was
+    cut short, this run resumes it: items it already checked within the
+    freshness window are skipped and their alerts reused. A startup run
+    also skips items checked within the window by earlier runs.
+    """
+    settings = load_settings()
+    items = settings.items
+    scraper_config = settings.scraper
+    schedule_config = settings.schedule
+    fresh_seconds = schedule_config.get('fresh_seconds', 900)
+
+    budget = get_run_budget(schedule_config)
+    deadline = time.monotonic() + budget if budget is not None else None
+
+    scraper = get_scraper(scraper_config)
+    scraper.reset_stats()
+    history = get_history()
+    alerts = []
+
+    listing_sources = list(settings.listing_sources)
+
+    # Only start a browser when some enabled item actually needs rendering
+    needs_renderer = any(item.render and item.enabled for item in items) or any(
+        source.get('render') and source.get('enabled', True) for source in listing_sources
+    )
+    if needs_renderer and scraper.renderer is None:
+        try:
+            scraper.renderer = create_renderer(scraper_config.get('renderer', {}))
+        except ScraperError as e:
+            logger.error(f"ERROR: Browser renderer unavailable: {e}")
 
     logger.info(f"Starting price check for {len(items)} items")
 
+    enabled_items = []
     for item in items:
-        if not item.get('enabled', True):
-            logger.info(f"Skipping disabled item: {item['name']}")
+        if not item.enabled:
+            logger.info(f"Skipping disabled item: {item.name}")
             continue
+        enabled_items.append(item)
+
+    # In sharded mode only check the pages this instance owns
+    shard = get_coordinator(settings.sharding)
+    if shard is not None:
+        members = shard.refresh()
+        owned_items = [
+            item for item in enabled_items
+            if shard.owns(item.page_url) and shard.claim(item.page_url)
+        ]
+        listing_sources = [
+            source for source in listing_sources
+            if shard.owns(source['page_url']) and shard.claim(source['page_url'])
+        ]
+        logger.info(
+            f"SHARD: {shard.instance_id} | {len(members)} instance(s) | "
+            f"owns {len(owned_items)} of {len(enabled_items)} item(s), "
+            f"{len(listing_sources)} listing(s)"
+        )
+        enabled_items = owned_items
+    instance = shard.instance_id if shard is not None else ''
+
+    now = time.time()
+    unfinished = history.unfinished_run(instance)
+    if unfinished is not None:
+        run_id, started_at = unfinished
+        done = history.run_checks(run_id, since=now - fresh_seconds)
+        resumed = [item for item in enabled_items if item.key in done]
+        for item in resumed:
+            alerts.extend(done[item.key])
+        enabled_items = [item for item in enabled_items if item.key not in done]
+        logger.info(
+            f"RESUME: run #{run_id} from {datetime.fromtimestamp(started_at):%Y-%m-%d %H:%M:%S} | "
+            f"{len(resumed)} item(s) already checked, {len(enabled_items)} left"
+        )
+    else:
+        run_id = history.start_run(now, instance)
+
+    summaries = history.summaries(item.key for item in enabled_items)
+
+    if startup:
+        fresh = {
+            key for key, summary in summaries.items()
+            if (summary.last_check or 0) > now - fresh_seconds
+        }
+        if fresh:
+            logger.info(f"FRESH: skipping {len(fresh)} item(s) checked in the last {fresh_seconds}s")
+            enabled_items = [item for item in enabled_items if item.key not in fresh]
+
+    # Most urgent items first, so they finish even if the budget runs out
+    enabled_items = plan_run(enabled_items, summaries)
+
+    # Listing pages first: one fetch can update many items at once
+    remaining_items = enabled_items
+    if listing_sources:
+        listings = load_listings(scraper, listing_sources, logger)
+        remaining_items = []
+        for item in enabled_items:
+            values = listings.match(item)
+            if values is None:
+                remaining_items.append(item)
+            else:
+                alerts.extend(finish_item(item, values, logger, history, run_id))
+
+        logger.info(
+            f"Updated {len(enabled_items) - len(remaining_items)} item(s) from listing pages, "
+            f"{len(remaining_items)} need their product page"
+        )
 
-        name = item['name']
-        url = item['url']
-        css_selector = item.get('css_selector', '.price')
-        threshold = item['threshold']
-        currency = item.get('currency', '')
-        parameter = item.get('parameter', 'price')
+    pages = group_by_page(remaining_items)
+    logger.info(f"Fetching {len(pages)} unique page(s) for {len(remaining_items)} item(s)")
+
+    parse_pool = get_parse_pool(settings.parsing)
+    # Pages fetched but still being parsed by the pool: (items, future, start time, job)
+    in_flight = deque()
+    deferred = 0
+
+    for (_, render), page_items in pages.items():
+        if deadline is not None and time.monotonic() >= deadline:
+            deferred += len(page_items)
+            continue
+
+        url = page_items[0].url
+        field_sets = [item.fields for item in page_items]
+        started = time.perf_counter()
 
         try:
-            current_price = scraper.get_price(url, css_selector)
-
-            if current_price < threshold:
-                logger.info(
-                    f"ALERT: {name} | {parameter}: {current_price:,.2f} {currency} "
-                    f"(below threshold: {threshold:,.2f} {currency})"
-                )
-                alerts.append({
-                    'name': name,
-                    'url': url,
-                    'current_price': current_price,
-                    'threshold': threshold,
-                    'currency': currency
-                })
+            if parse_pool is None or scraper.streams(field_sets, render):
+                results = scraper.get_fields(url, field_sets, render=render)
             else:
-                logger.info(
-                    f"OK: {name} | {parameter}: {current_price:,.2f} {currency} "
-                    f"(threshold: {threshold:,.2f} {currency})"
-                )
-
+                # Hand the raw body to a worker and go fetch the next page
+                first_spec = next(iter(field_sets[0].values()))
+                body, encoding = scraper.fetch_document(url, render, wait_for=first_spec['selector'])
+                job = (body, encoding, field_sets)
+                in_flight.append((page_items, parse_pool.submit(*job), started, job))
+                # Bound the number of bodies held in memory
+                if len(in_flight) > parse_pool.processes * 2:
+                    alerts.extend(collect_parsed(*in_flight.popleft(), logger, history, run_id))
+                continue
         except ScraperError as e:
-            logger.error(f"ERROR: {name} | Failed to scrape: {e}")
+            for item in page_items:
+                logger.error(f"ERROR: {item.name} | Failed to scrape: {e}")
+                alerts.extend(finish_item(item, None, logger, history, run_id, time.perf_counter() - started))
+            continue
         except Exception as e:
-            logger.error(f"ERROR: {name} | Unexpected error: {e}")
+            for item in page_items:
+                logger.error(f"ERROR: {item.name} | Unexpected error: {e}")
+                alerts.extend(finish_item(item, None, logger, history, run_id, time.perf_counter() - started))
+            continue
+
+        elapsed = time.perf_counter() - started
+        for item, values in zip(page_items, results):
+            alerts.extend(finish_item(item, values, logger, history, run_id, elapsed))
+
+    while in_flight:
+        alerts.extend(collect_parsed(*in_flight.popleft(), logger, history, run_id))
+
+    if deferred:
+        logger.warning(
+            f"DEFERRED: {deferred} item(s) not checked within the {budget:.0f}s run budget; "
+            f"they move up the queue next run"
+        )
+
+    log_transfer_stats(scraper, logger)
 
     return alerts
 
 
+def run_instance() -> str:
+    """Name this instance's runs are recorded under: its shard instance ID, or '' unsharded."""
+    shard = get_coordinator(load_settings().sharding)
+    return shard.instance_id if shard is not None else ''
+
+
+def finish_run() -> None:
+    """Mark the current run complete, once its alerts have been handed off."""
+    history = get_history()
+    unfinished = history.unfinished_run(run_instance())
+    if unfinished is not None:
+        history.finish_run(unfinished[0], time.time())
+
+
+def log_transfer_stats(scraper: PriceScraper, logger: logging.Logger) -> None:
+    """Log bytes transferred and connections used per host, and egress route health."""
+    for host, stats in sorted(scraper.get_stats().items()):
+        ratio = stats['body_bytes'] / stats['wire_bytes'] if stats['wire_bytes'] else 0
+        logger.info(
+            f"TRANSFER: {host} | {stats['requests']} request(s) | "
+            f"{stats['wire_bytes'] / 1024:,.1f} KB on the wire | "
+            f"{stats['body_bytes'] / 1024:,.1f} KB decoded ({ratio:.1f}x)"
+        )
+
+    for host, stats in sorted(scraper.get_connection_stats().items()):
+        if 'connections' in stats:
+            logger.info(
+                f"CONNECTIONS: {host} | {stats['requests']} request(s) over "
+                f"{stats['connections']} connection(s) | {stats['reused']} reused"
+            )
+        else:
+            logger.info(f"CONNECTIONS: {host} | {stats['requests']} request(s) over HTTP/2")
+
+    routes = scraper.get_route_stats()
+    if len(routes) > 1:
+        for route in routes:
+            latency = f"{route['latency_ms']} ms" if route['latency_ms'] is not None else 'n/a'
+            state = 'evicted' if route['evicted'] else 'ok'
+            if route['blocked_by']:
+                state += f", blocked by {', '.join(route['blocked_by'])}"
+            logger.info(
+                f"ROUTE: {route['name']} | {route['requests']} request(s), {route['failures']} failed | "
+                f"latency {latency} | {state}"
+            )
+
+
 def send_notifications(alerts: List[Dict], logger: logging.Logger) -> bool:
     """Send email notifications for price alerts."""
     if not alerts:
@@ -151,25 +590,21 @@ def send_notifications(alerts: List[Dict], logger: logging.Logger) -> bool:
         return True
 
     try:
-        # Load configuration
-        config = load_config()
-
-        # Get email config
-        email_config = config.get('email')
-        if not email_config:
+        email = load_settings().email
+        if email is None:
             logger.error("Email configuration not found in config.json")
             logger.info(f"Would have sent {len(alerts)} alert(s)")
             return False
 
         # Check if email is configured
-        if email_config.get('sender_email') == 'your_email@gmail.com':
+        if email.sender_email == 'your_email@gmail.com':
             logger.warning(
                 "Email not configured. Please update your config file"
             )
             logger.info(f"Would have sent {len(alerts)} alert(s)")
             return False
 
-        notifier = EmailNotifier(email_config)
+        notifier = EmailNotifier(email)
         notifier.send_batch_alert(alerts)
         logger.info(f"Successfully sent email with {len(alerts)} alert(s)")
         return True
@@ -185,8 +620,8 @@ def send_notifications(alerts: List[Dict], logger: logging.Logger) -> bool:
         return False
 
 
-def main() -> int:
-    """Main entry point."""
+def main(startup: bool = False) -> int:
+    """Main entry point; 'startup' marks the scheduler's first run after a (re)start."""
     logger = setup_logging()
 
     logger.info("=" * 60)
@@ -195,7 +630,7 @@ def main() -> int:
 
     try:
         # Check prices
-        alerts = check_prices(logger)
+        alerts = check_prices(logger, startup=startup)
 
         # Send notifications if any alerts
         if alerts:
@@ -203,6 +638,9 @@ def main() -> int:
         else:
             logger.info("All prices are at or above thresholds")
 
+        # Only now can a restart no longer lose this run's alerts
+        finish_run()
+
         logger.info("Price check completed successfully")
         return 0
 
@@ -212,6 +650,9 @@ def main() -> int:
     except json.JSONDecodeError as e:
         logger.error(f"Invalid JSON in configuration file: {e}")
         return 1
+    except ConfigError as e:
+        logger.error(f"Invalid configuration file: {e}")
+        return 1
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         return 1
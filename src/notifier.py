@@ -3,17 +3,19 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Dict, List
 
+from settings import EmailSettings
+
 
 class EmailNotifier:
     """Sends email notifications for price alerts."""
 
-    def __init__(self, config: Dict):
-        self.smtp_server = config['smtp_server']
-        self.smtp_port = config['smtp_port']
-        self.sender_email = config['sender_email']
-        self.sender_password = config['sender_password']
-        self.recipient_email = config['recipient_email']
-        self.use_tls = config.get('use_tls', True)
+    def __init__(self, email: EmailSettings):
+        self.smtp_server = email.smtp_server
+        self.smtp_port = email.smtp_port
+        self.sender_email = email.sender_email
+        self.sender_password = email.sender_password
+        self.recipient_email = email.recipient_email
+        self.use_tls = email.use_tls
 
     def send_alert(self, item_name: str, url: str, current_price: float,
                    threshold: float, currency: str) -> bool:
@@ -42,18 +44,36 @@ This is an automated message from SaleNotificator.
         if not alerts:
             return True
 
-        subject = f"Price Alert: {len(alerts)} item(s) below threshold"
-
-        body_parts = ["Price Alert!\n\nThe following items have dropped below your threshold:\n"]
+        if any('condition' in alert for alert in alerts):
+            subject = f"Price Alert: {len(alerts)} alert(s) triggered"
+            body_parts = ["Price Alert!\n\nThe following items have matched your alert conditions:\n"]
+        else:
+            subject = f"Price Alert: {len(alerts)} item(s) below threshold"
+            body_parts = ["Price Alert!\n\nThe following items have dropped below your threshold:\n"]
 
         for i, alert in enumerate(alerts, 1):
-            body_parts.append(f"""
-{i}. {alert['name']}
-   Current Price: {alert['current_price']:,.2f} {alert['currency']}
-   Your Threshold: {alert['threshold']:,.2f} {alert['currency']}
-   Savings: {alert['threshold'] - alert['current_price']:,.2f} {alert['currency']}
-   Link: {alert['url']}
-""")
+            currency = alert['currency']
+            if 'condition' in alert:
+                # Rule-based alert on any extracted field
+                lines = [
+                    f"   {alert['parameter']}: {_format_value(alert['value'])}",
+                    f"   Condition: {alert['condition']}",
+                ]
+            else:
+                lines = [
+                    f"   Current Price: {alert['current_price']:,.2f} {currency}",
+                    f"   Your Threshold: {alert['threshold']:,.2f} {currency}",
+                    f"   Savings: {alert['threshold'] - alert['current_price']:,.2f} {currency}",
+                ]
+
+            # Other fields extracted from the same page
+            parameter = alert.get('parameter', 'price')
+            for field, value in alert.get('fields', {}).items():
+                if field != parameter and value is not None:
+                    lines.append(f"   {field}: {_format_value(value)}")
+
+            lines.append(f"   Link: {alert['url']}")
+            body_parts.append(f"\n{i}. {alert['name']}\n" + '\n'.join(lines) + '\n')
 
         body_parts.append("\n---\nThis is an automated message from SaleNotificator.")
 
@@ -80,6 +100,13 @@ This is an automated message from SaleNotificator.
             raise NotifierError(f"Failed to send email: {e}")
 
 
+def _format_value(value) -> str:
+    """Format a numeric or text field value for an email."""
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    return str(value)
+
+
 class NotifierError(Exception):
     """Exception raised when notification fails."""
     pass
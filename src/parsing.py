@@ -0,0 +1,89 @@
+"""
+Process-pool parsing stage for SaleNotificator.
+
+HTML parsing is CPU-bound and holds the GIL, and huge pages leave the
+long-running daemon with a bloated heap. When enabled, raw page bodies are
+sent to a bounded pool of worker processes that parse them and return only
+the small extracted values and timings. Workers are replaced after a fixed
+number of tasks, so parser memory is returned to the OS.
+
+A worker that dies (for instance killed for using too much memory) breaks
+the whole executor. The next submit then starts a fresh one, and pages that
+were waiting on the broken pool can be parsed in-process with
+extract_in_worker().
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Union
+
+from scraper import PageExtractor
+
+
+# One extractor per worker process, created on first use
+_extractor: Optional[PageExtractor] = None
+
+
+def extract_in_worker(body: Union[str, bytes], encoding: Optional[str],
+                      field_sets: List[Dict[str, Dict]]) -> Dict:
+    """
+    Parse a page body and extract every field set (runs in a worker).
+
+    Returns {'results': [...], 'parse_seconds': ..., 'extract_seconds': ...}.
+    """
+    global _extractor
+    if _extractor is None:
+        _extractor = PageExtractor()
+
+    start = time.perf_counter()
+    soup = _extractor.parse(body, encoding)
+    parsed = time.perf_counter()
+
+    results = [_extractor.extract_fields(soup, fields) for fields in field_sets]
+    soup.decompose()
+
+    return {
+        'results': results,
+        'parse_seconds': parsed - start,
+        'extract_seconds': time.perf_counter() - parsed,
+    }
+
+
+class ParsePool:
+    """A bounded pool of parser processes that are recycled after N tasks."""
+
+    def __init__(self, processes: int = 2, max_tasks_per_child: int = 20):
+        self.processes = processes
+        self.max_tasks_per_child = max_tasks_per_child
+        self.restarts = 0
+        self._executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # Worker recycling requires spawned (not forked) processes
+        return ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            max_tasks_per_child=self.max_tasks_per_child
+        )
+
+    def submit(self, body: Union[str, bytes], encoding: Optional[str],
+               field_sets: List[Dict[str, Dict]]) -> Future:
+        """
+        Queue a page body for parsing; the future resolves to extract_in_worker's result.
+
+        A broken executor is replaced before the page is queued. Futures of
+        pages already queued on it raise BrokenProcessPool.
+        """
+        try:
+            return self._executor.submit(extract_in_worker, body, encoding, field_sets)
+        except BrokenProcessPool:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._create_executor()
+            self.restarts += 1
+            return self._executor.submit(extract_in_worker, body, encoding, field_sets)
+
+    def close(self):
+        """Shut the worker processes down."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,64 @@
+"""
+Run planner for SaleNotificator.
+
+Orders tracked items so the checks most likely to fire an alert run first:
+items whose price is close to their threshold, items whose price has been
+moving, items that have not been checked successfully for a while, scaled
+by a user-set weight. Combined with a per-run time budget, whatever is left
+over is simply deferred; it has only become staler by the next run, so it
+moves up the queue.
+"""
+
+import time
+from statistics import mean, pstdev
+from typing import Dict, List, Optional
+
+from history import ItemSummary
+from settings import TrackedItem
+
+
+# Relative importance of the priority components
+CLOSENESS_WEIGHT = 0.5
+VOLATILITY_WEIGHT = 0.2
+STALENESS_WEIGHT = 0.3
+
+# Seconds without a successful check after which an item counts as fully stale
+STALE_AFTER_SECONDS = 24 * 3600
+
+
+def priority(item: TrackedItem, summary: Optional[ItemSummary], now: float) -> float:
+    """Score an item between 0 and its weight; higher is checked first."""
+    weight = item.weight
+    if summary is None or summary.last_success is None:
+        # Never checked successfully: as urgent as it gets
+        return weight
+
+    threshold = item.threshold
+    if threshold and summary.last_value is not None:
+        distance = abs(summary.last_value - threshold) / abs(threshold)
+        closeness = 1.0 - min(distance, 1.0)
+    else:
+        closeness = 0.5
+
+    values = summary.recent_values
+    volatility = 0.0
+    if len(values) > 1 and mean(values):
+        # Coefficient of variation; 10% swings count as fully volatile
+        volatility = min(pstdev(values) / abs(mean(values)) * 10, 1.0)
+
+    staleness = min((now - summary.last_success) / STALE_AFTER_SECONDS, 1.0)
+
+    return weight * (
+        CLOSENESS_WEIGHT * closeness
+        + VOLATILITY_WEIGHT * volatility
+        + STALENESS_WEIGHT * staleness
+    )
+
+
+def plan_run(items: List[TrackedItem], summaries: Dict[str, ItemSummary],
+             now: Optional[float] = None) -> List[TrackedItem]:
+    """Return the items ordered from highest to lowest priority."""
+    now = time.time() if now is None else now
+    scores = {id(item): priority(item, summaries.get(item.key), now) for item in items}
+    # sorted() is stable, so ties keep their config order
+    return sorted(items, key=lambda item: -scores[id(item)])
@@ -0,0 +1,399 @@
+"""
+Price text parsing for SaleNotificator.
+
+Turns the text of a price element ("$1,234.56", "1.234,56 €", "CHF 1'234.–")
+into a float. One parser is compiled per number format and reused:
+
+- the decimal and grouping separators come from the item's 'locale', so
+  "1,234" is 1234 in "en" and 1.234 in "de" instead of a guess;
+- without a locale the item's 'currency' only suggests a format: numbers
+  it leaves ambiguous ("€1,299") and text that does not fit it ("€12.99"
+  on an English shop) are guessed as in "auto";
+- numbers that are clearly not the price (percentages, star ratings,
+  review, stock and pack counts, "was"/"save" amounts) are skipped before
+  any conversion;
+- a number next to a currency sign or code wins over bare numbers.
+
+Without a locale or currency the "auto" format guesses the decimal
+separator of each number, as the scraper always did.
+
+Most texts are a bare amount ("$264.99"); those are read with str methods
+alone, without running a regex.
+
+Run this module to check the correctness table and time the parser against
+the scraper's previous one:
+
+    python src/prices.py
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+
+# Number formats: (decimal separator, grouping separators, Indian lakh grouping)
+NUMBER_FORMATS: Dict[str, Tuple[str, str, bool]] = {
+    'en': ('.', ',', False),                  # 1,234.56
+    'de': (',', '.\u0020\u00a0\u202f', False),  # 1.234,56 and 1 234,56
+    'ch': ('.', "'\u2019", False),            # 1'234.56
+    'in': ('.', ',', True),                   # 1,23,456.78
+}
+
+# Aliases for locales that share a format
+LOCALE_ALIASES = {
+    'us': 'en', 'gb': 'en', 'uk': 'en', 'au': 'en', 'nz': 'en', 'ca': 'en', 'ie': 'en',
+    'jp': 'en', 'cn': 'en', 'sg': 'en', 'hk': 'en', 'mx': 'en',
+    'fr': 'de', 'nl': 'de', 'it': 'de', 'es': 'de', 'pt': 'de', 'br': 'de', 'se': 'de',
+    'no': 'de', 'dk': 'de', 'fi': 'de', 'pl': 'de', 'cz': 'de', 'ru': 'de', 'at': 'de',
+    'be': 'de', 'tr': 'de',
+    'li': 'ch',
+}
+
+# Number format used when an item only names its currency
+CURRENCY_LOCALES = {
+    'USD': 'en', 'NZD': 'en', 'AUD': 'en', 'CAD': 'en', 'GBP': 'en', 'JPY': 'en',
+    'CNY': 'en', 'SGD': 'en', 'HKD': 'en', 'MXN': 'en',
+    'EUR': 'de', 'BRL': 'de', 'SEK': 'de', 'NOK': 'de', 'DKK': 'de', 'PLN': 'de',
+    'CZK': 'de', 'HUF': 'de', 'RUB': 'de', 'TRY': 'de',
+    'CHF': 'ch',
+    'INR': 'in',
+}
+
+# Whole text that is just an amount with an optional currency: the common case
+_AMOUNT_ONLY = (
+    r'\s*(?:[$€£¥₹₩₽₺₪₫฿]|[A-Z]{1,3}\$|[A-Z]{3}|kr\.?|Fr\.?|Rs\.?)?\s*'
+    r'(?P<num>{number})'
+    r'\s*(?:[$€£¥₹₩₽₺₪₫฿]|[A-Z]{3}|kr|zł|Kč)?\s*'
+)
+
+# The symbol or word right after a number, and right before it (matched on
+# the reversed preceding text, since regexes only anchor forwards)
+_AFTER = r'(?:\s*(?P<after>[%×$€£¥₹₩₽₺₪₫฿]|/\s*\d|[^\W\d_]+))?'
+_BEFORE_REVERSED = re.compile(r'\s*(?P<sign>[$€£¥₹₩₽₺₪₫฿×])?\s*:?\s*(?P<word>\.?[^\W\d_]+)?')
+
+_CURRENCY_SIGNS = frozenset('$€£¥₹₩₽₺₪₫฿')
+_CURRENCY_WORDS = frozenset({'kr', 'zł', 'kč', 'fr', 'rs'})
+
+# Words after a number that make it something other than the price
+_UNIT_WORDS = frozenset({
+    'out', 'star', 'stars', 'rating', 'ratings', 'review', 'reviews', 'vote', 'votes',
+    'sold', 'left', 'item', 'items', 'unit', 'units', 'pcs', 'piece', 'pieces', 'pack',
+    'x', 'customer', 'customers', 'people', 'answered', 'question', 'questions', 'bought',
+})
+
+# Words right before a number that make it a count ("Qty: 2"), unless a
+# currency sign stands between them ("3 x $5.00")
+_SKIP_WORDS = frozenset({'qty', 'quantity', 'of', 'x'})
+
+# Words before a number, sign or not, that make it an earlier price
+_OLD_PRICE_WORDS = frozenset({'was', 'rrp', 'save', 'saving', 'reg', 'before'})
+
+# Characters looked at before a number
+_CONTEXT = 16
+
+# Whitespace and currency signs around a bare amount
+_AMOUNT_STRIP = ' \t\r\n\u00a0\u202f$€£¥₹₩₽₺₪₫฿'
+
+_DIGIT = re.compile(r'\d')
+
+# One separator followed by exactly three digits: "1,299" or "1.299"
+_AMBIGUOUS = re.compile(r'\d+[.,]\d{3}')
+
+
+class PriceParser:
+    """
+    Parses price text in one number format.
+
+    A 'hinted' format was only suggested by the currency: ambiguous numbers
+    are converted as in "auto", and text it finds no price in is parsed
+    again in "auto".
+    """
+
+    def __init__(self, locale: str = 'auto', hinted: bool = False):
+        self.locale = locale
+        self._fallback = price_parser() if hinted and locale != 'auto' else None
+        if locale == 'auto':
+            # Any mix of separators; resolved per number in _convert_auto
+            self._decimal = '.'
+            self._group = ','
+            number = r"\d(?:[\d.,'\u2019]*\d)?"
+            self._amount = re.compile(_AMOUNT_ONLY.replace('{number}', number))
+            self._tokens = re.compile(rf"(?<![\d.,'\u2019])(?P<num>{number})(?!\d){_AFTER}")
+            self._convert = self._convert_auto
+            return
+
+        decimal, groups, lakh = NUMBER_FORMATS[locale]
+        group = '[' + re.escape(groups) + ']'
+        if lakh:
+            integer = rf'\d{{1,3}}(?:{group}\d{{3}})+|\d{{1,2}}(?:{group}\d{{2}})+{group}\d{{3}}|\d+'
+        else:
+            integer = rf'\d{{1,3}}(?:{group}\d{{3}})+|\d+'
+        number = rf'(?:{integer})(?:{re.escape(decimal)}(?:\d+|[-–]{{1,2}}))?'
+        self._amount = re.compile(_AMOUNT_ONLY.replace('{number}', number))
+        # A number may not run on into more digits or separators, so text
+        # in another locale's format is rejected instead of half-parsed
+        separators = re.escape(groups + decimal + ".,'\u2019")
+        self._tokens = re.compile(
+            rf'(?<![\d{separators}])(?P<num>{number})(?!\d|[{separators}]\d){_AFTER}'
+        )
+        self._groups = groups
+        self._decimal = decimal
+        # Separator read by the fast path; Indian grouping is left to the regexes
+        self._group = None if lakh else groups[0]
+        self._convert = self._convert_hinted if self._fallback else self._convert_locale
+
+    def parse(self, text: Optional[str]) -> Optional[float]:
+        """Return the price in a piece of text, or None when there is none."""
+        if not text:
+            return None
+
+        # Fast path: a bare amount in the format ("$264.99", "$1,234.56", "12,99 €").
+        # A hinted format leaves grouped numbers to the regexes, which know
+        # when "1.299" is ambiguous.
+        whole, separator, fraction = text.strip(_AMOUNT_STRIP).partition(self._decimal)
+        if self._group and self._group in whole and not self._fallback:
+            head, *groups = whole.split(self._group)
+            if 0 < len(head) <= 3 and all(len(group) == 3 for group in groups):
+                whole = head + ''.join(groups)
+        if whole.isdecimal() and (not separator or fraction.isdecimal()) and not (
+                self._fallback and len(fraction) == 3):
+            return float(f"{whole}.{fraction}") if separator else float(whole)
+
+        if not _DIGIT.search(text):
+            return None
+
+        price = self._parse(text)
+        if price is None and self._fallback is not None:
+            return self._fallback.parse(text)
+        return price
+
+    def _parse(self, text: str) -> Optional[float]:
+        amount = self._amount.fullmatch(text)
+        if amount is not None:
+            return self._convert(amount.group('num'))
+
+        fallback = None
+        for match in self._tokens.finditer(text):
+            currency = False
+            after = match.group('after')
+            if after:
+                if after in _CURRENCY_SIGNS or after.lower() in _CURRENCY_WORDS or (
+                        len(after) == 3 and after.isupper()):
+                    currency = True
+                elif after in '%×' or after[0] == '/' or after.lower() in _UNIT_WORDS:
+                    continue
+
+            start = match.start()
+            if start:
+                before = _BEFORE_REVERSED.match(text[max(0, start - _CONTEXT):start][::-1])
+                sign, word = before.group('sign', 'word')
+                if sign == '×':
+                    continue
+                if word:
+                    word = word[::-1].rstrip('.')
+                    if word.lower() in _OLD_PRICE_WORDS or (not sign and word.lower() in _SKIP_WORDS):
+                        continue
+                    if not sign and (word.lower() in _CURRENCY_WORDS or (len(word) == 3 and word.isupper())):
+                        currency = True
+                if sign:
+                    currency = True
+
+            value = self._convert(match.group('num'))
+            if value is None:
+                continue
+            if currency:
+                return value
+            if fallback is None:
+                fallback = value
+
+        return fallback
+
+    def _convert_locale(self, number: str) -> Optional[float]:
+        # str.replace is much cheaper than translate() for these short strings
+        for char in self._groups:
+            if char in number:
+                number = number.replace(char, '')
+        if self._decimal != '.':
+            number = number.replace(self._decimal, '.')
+        try:
+            return float(number)
+        except ValueError:
+            # "12,-" / "49.–": whole units
+            return float(number.rstrip('-–.'))
+
+    def _convert_hinted(self, number: str) -> Optional[float]:
+        # Without an explicit locale, "1,299" is read as it always was
+        if _AMBIGUOUS.fullmatch(number):
+            return self._convert_auto(number)
+        return self._convert_locale(number)
+
+    def _convert_auto(self, number: str) -> Optional[float]:
+        if "'" in number or '\u2019' in number:
+            # 1'234.56
+            number = number.replace("'", '').replace('\u2019', '')
+        if ',' in number and '.' in number:
+            # The later separator is the decimal one
+            if number.rfind(',') > number.rfind('.'):
+                number = number.replace('.', '').replace(',', '.')
+            else:
+                number = number.replace(',', '')
+        elif ',' in number:
+            parts = number.split(',')
+            if len(parts) == 2 and len(parts[1]) == 2:
+                # 123,45
+                number = number.replace(',', '.')
+            else:
+                # 1,234 or 12,345,678
+                number = number.replace(',', '')
+        elif number.count('.') > 1:
+            # 1.234.567
+            number = number.replace('.', '')
+
+        try:
+            return float(number)
+        except ValueError:
+            return None
+
+
+def resolve_locale(locale: Optional[str] = None, currency: Optional[str] = None) -> str:
+    """
+    Pick the number format for an explicit locale, else for a currency.
+
+    A format picked by currency ends in '?' and is only a hint (see
+    PriceParser), since a currency does not say how a page writes numbers.
+    """
+    if locale:
+        # "de-CH" and "de_CH" name a country after the language; the country wins
+        parts = re.split(r'[-_]', locale.lower())
+        for part in reversed(parts):
+            if part in NUMBER_FORMATS:
+                return part
+            if part in LOCALE_ALIASES:
+                return LOCALE_ALIASES[part]
+        return 'auto'
+    if currency and currency.upper() in CURRENCY_LOCALES:
+        return CURRENCY_LOCALES[currency.upper()] + '?'
+    return 'auto'
+
+
+@lru_cache(maxsize=None)
+def price_parser(locale: Optional[str] = None) -> PriceParser:
+    """Return the shared, precompiled parser for a locale (None means auto)."""
+    if not locale:
+        return PriceParser('auto')
+    if locale.endswith('?'):
+        return PriceParser(resolve_locale(locale[:-1]), hinted=True)
+    return PriceParser(resolve_locale(locale))
+
+
+# Correctness table: (text, locale, expected price)
+EXAMPLES = [
+    ('$1,234.56', 'en', 1234.56),
+    ('NZ$ 89.00', 'en', 89.0),
+    ('1,234', 'en', 1234.0),
+    ('12,34', 'en', None),
+    ('$99.00 Save 20%', 'en', 99.0),
+    ('Was $129.99 Now $99.99', 'en', 99.99),
+    ('4.5 out of 5 stars', 'en', None),
+    ('(1,234 ratings)', 'en', None),
+    ('Qty: 2 $19.95', 'en', 19.95),
+    ('2 for $10', 'en', 10.0),
+    ('Pack of 3', 'en', None),
+    ('£ 7.99', 'en', 7.99),
+    ('¥12,800', 'en', 12800.0),
+    ('1.234,56 €', 'de', 1234.56),
+    ('1.234', 'de', 1234.0),
+    ('12,34 €', 'de', 12.34),
+    ('12,-', 'de', 12.0),
+    ('1\u00a0234,56 €', 'fr', 1234.56),
+    ('1 234,56 €', 'fr', 1234.56),
+    ('1 299 kr', 'se', 1299.0),
+    ("CHF 1'234.50", 'ch', 1234.5),
+    ('CHF 49.–', 'ch', 49.0),
+    ('₹1,23,456.00', 'in', 123456.0),
+    ('$1,234.56', 'de', None),
+    ('1.234,56', 'en', None),
+    ("CHF 1'234.50", 'en', None),
+    ('$1,234.56', None, 1234.56),
+    ("CHF 1'234.50", None, 1234.5),
+    ('1.234,56 €', None, 1234.56),
+    ('12,34', None, 12.34),
+    ('1,234', None, 1234.0),
+    ('In stock', None, None),
+    ('3 x $5.00', 'en', 5.0),
+    ('Was $129.99', 'en', None),
+    ('1.234,56 €', resolve_locale(currency='EUR'), 1234.56),
+    ('1.234,5', resolve_locale(currency='EUR'), 1234.5),
+    ('€1,299', resolve_locale(currency='EUR'), 1299.0),
+    ('€ 1,299', resolve_locale(currency='EUR'), 1299.0),
+    ('1,299 €', resolve_locale(currency='EUR'), 1299.0),
+    ('12,99 €', resolve_locale(currency='EUR'), 12.99),
+    ('€12.99', resolve_locale(currency='EUR'), 12.99),
+    ('$1,234.56', resolve_locale(currency='EUR'), 1234.56),
+]
+
+
+# Bare amounts, the bulk of real price texts: (text, locale)
+AMOUNTS = [
+    ('$264.99', 'en'), ('$1,234.56', 'en'), ('£ 7.99', 'en'), ('¥12,800', 'en'),
+    ('$19.95', None), ('€12.99', None), ('12,99 €', 'de'), ('1.234,56 €', 'de'),
+]
+
+
+def _baseline_parse(text: Optional[str]) -> Optional[float]:
+    """The scraper's price parser before this module, kept to benchmark against."""
+    if not text:
+        return None
+    cleaned = re.sub(r'[^\d.,]', '', text.strip())
+    if not cleaned:
+        return None
+    if ',' in cleaned and '.' in cleaned:
+        if cleaned.rfind(',') > cleaned.rfind('.'):
+            cleaned = cleaned.replace('.', '').replace(',', '.')
+        else:
+            cleaned = cleaned.replace(',', '')
+    elif ',' in cleaned:
+        parts = cleaned.split(',')
+        if len(parts) == 2 and len(parts[1]) == 2:
+            cleaned = cleaned.replace(',', '.')
+        else:
+            cleaned = cleaned.replace(',', '')
+    try:
+        return float(cleaned)
+    except ValueError:
+        return None
+
+
+def check_examples() -> int:
+    """Print the correctness table; returns the number of mismatches."""
+    failures = 0
+    for text, locale, expected in EXAMPLES:
+        result = price_parser(locale).parse(text)
+        ok = result == expected
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {locale or 'auto':5} {text!r:28} -> {result} (expected {expected})")
+    return failures
+
+
+def benchmark(rounds: int = 20000) -> None:
+    """Time the parser against the previous one on bare amounts and on the correctness table."""
+    import timeit
+
+    for label, texts in (('amounts', AMOUNTS), ('table', [(text, locale) for text, locale, _ in EXAMPLES])):
+        cases = [(price_parser(locale).parse, text) for text, locale in texts]
+        baseline = [(_baseline_parse, text) for text, _ in texts]
+        timings = [
+            timeit.timeit(lambda: [parse(text) for parse, text in runs], number=rounds)
+            / (rounds * len(texts)) * 1e9
+            for runs in (cases, baseline)
+        ]
+        print(f"{label:8} {timings[0]:6,.0f} ns per parse, previous parser {timings[1]:6,.0f} ns "
+              f"({len(texts)} texts x {rounds} rounds)")
+
+
+if __name__ == '__main__':
+    import sys
+
+    mismatches = check_examples()
+    benchmark()
+    sys.exit(1 if mismatches else 0)
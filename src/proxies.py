@@ -0,0 +1,259 @@
+"""
+Egress routes for SaleNotificator.
+
+Without proxies every request leaves through one session from one address,
+so the per-host delay between requests is the ceiling on how fast a single
+retailer can be checked. With 'scraper.proxies' configured, requests are
+spread over several egress routes: the direct connection plus each proxy.
+
+- Every route has its own HTTP session, so its own cookie jar and
+  Cloudflare clearance, and its own per-host request slots. Two routes can
+  fetch from the same retailer back to back while each still keeps the
+  configured delay.
+- Routes are scored by success rate and latency; a request goes to the
+  route whose next slot for the host comes first, the best-scored one on
+  a tie.
+- A route that gets a 403, a 429 or a bot challenge from a host is evicted
+  for that host for 'evict_seconds'; one whose connections keep failing is
+  evicted for every host. The last route left for a host is never evicted.
+
+Run this module to try the pool against local stand-in proxies:
+
+    python src/proxies.py
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Responses that mean a host is refusing this route rather than the page
+BLOCK_STATUSES = frozenset({403, 429})
+
+# Weight of the newest sample in the moving averages
+SMOOTHING = 0.2
+
+# Latency assumed for a route before its first response (seconds)
+DEFAULT_LATENCY = 1.0
+
+
+def is_blocked(status_code: int, headers) -> bool:
+    """Whether a response means the host blocked or challenged the route."""
+    return status_code in BLOCK_STATUSES or headers.get('cf-mitigated') == 'challenge'
+
+
+def route_name(proxy_url: str) -> str:
+    """Label a proxy by host and port, leaving out any credentials."""
+    parsed = urlparse(proxy_url)
+    return f"{parsed.hostname}:{parsed.port}" if parsed.port else str(parsed.hostname)
+
+
+class Route:
+    """One egress route (the direct connection or a proxy) and its health."""
+
+    def __init__(self, name: str, proxy: Optional[str] = None):
+        self.name = name
+        self.proxy = proxy
+        # HTTP session of this route, created by the scraper on first use
+        self.session = None
+        # Hosts whose session has been warmed up (see PriceScraper._get)
+        self.warmed: set = set()
+        # Next free request slot per host
+        self.next_request_at: Dict[str, float] = {}
+        self.latency: Optional[float] = None
+        self.success_rate = 1.0
+        self.consecutive_failures = 0
+        # Evicted for every host until, and for single hosts until
+        self.evicted_until = 0.0
+        self.blocked_until: Dict[str, float] = {}
+        # Counters since the last reset_stats()
+        self.requests = 0
+        self.failures = 0
+
+    def available(self, host: str, now: float) -> bool:
+        """Whether the route may be used for 'host' right now."""
+        return self.evicted_until <= now and self.blocked_until.get(host, 0) <= now
+
+    @property
+    def score(self) -> float:
+        """Higher is better: reliable and fast."""
+        latency = DEFAULT_LATENCY if self.latency is None else self.latency
+        return self.success_rate / (0.1 + latency)
+
+
+class ProxyPool:
+    """Spreads requests over egress routes and tracks their health."""
+
+    def __init__(self, proxies: Optional[List[str]] = None, direct: bool = True,
+                 delay: float = 2.0, evict_seconds: float = 1800, max_failures: int = 3):
+        self.delay = delay
+        self.evict_seconds = evict_seconds
+        self.max_failures = max_failures
+        # The renderer and a proxy-less setup always go out directly
+        self.direct = Route('direct')
+        self.routes = [self.direct] if direct or not proxies else []
+        self.routes += [Route(route_name(url), url) for url in proxies or []]
+        # Every route that may hold a session, rotated or not
+        self.all_routes = self.routes if self.direct in self.routes else [self.direct] + self.routes
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger('SaleNotificator')
+
+    def _reserve(self, route: Route, host: str, now: float) -> float:
+        """Take the route's next slot for a host; returns seconds to wait. Lock held."""
+        slot = max(now, route.next_request_at.get(host, 0))
+        route.next_request_at[host] = slot + self.delay
+        return slot - now
+
+    def reserve(self, route: Route, host: str) -> float:
+        """Take a given route's next slot for a host, healthy or not."""
+        with self._lock:
+            return self._reserve(route, host, time.time())
+
+    def acquire(self, host: str) -> Optional[Tuple[Route, float]]:
+        """
+        Pick a route for a request to 'host' and take its next slot.
+
+        Returns (route, seconds to wait), or None when every route is
+        evicted for the host.
+        """
+        with self._lock:
+            now = time.time()
+            candidates = [route for route in self.routes if route.available(host, now)]
+            if not candidates:
+                return None
+            route = min(
+                candidates,
+                key=lambda r: (max(now, r.next_request_at.get(host, 0)), -r.score)
+            )
+            return route, self._reserve(route, host, now)
+
+    def report(self, route: Route, host: str, ok: bool, latency: Optional[float] = None,
+               blocked: bool = False):
+        """
+        Record the outcome of a request sent through a route.
+
+        'ok' means the route worked, whatever the page returned; 'blocked'
+        means the host refused or challenged the route.
+        """
+        with self._lock:
+            now = time.time()
+            route.requests += 1
+            if ok:
+                route.success_rate += SMOOTHING * (1.0 - route.success_rate)
+                route.consecutive_failures = 0
+                if latency is not None:
+                    route.latency = latency if route.latency is None else (
+                        route.latency + SMOOTHING * (latency - route.latency)
+                    )
+                return
+
+            route.failures += 1
+            route.success_rate -= SMOOTHING * route.success_rate
+            others = any(
+                other is not route and other.available(host, now) for other in self.routes
+            )
+
+            if blocked:
+                # Warm up again before the route is next used for this host
+                route.warmed.discard(host)
+                if others:
+                    route.blocked_until[host] = now + self.evict_seconds
+                    self._logger.warning(
+                        f"ROUTE: {route.name} | blocked by {host}; evicted for {self.evict_seconds:.0f}s"
+                    )
+                return
+
+            route.consecutive_failures += 1
+            if route.consecutive_failures >= self.max_failures and others:
+                route.consecutive_failures = 0
+                route.evicted_until = now + self.evict_seconds
+                self._logger.warning(
+                    f"ROUTE: {route.name} | {self.max_failures} failed requests in a row; "
+                    f"evicted for {self.evict_seconds:.0f}s"
+                )
+
+    def stats(self) -> List[Dict]:
+        """Health and counters of every route."""
+        now = time.time()
+        with self._lock:
+            return [{
+                'name': route.name,
+                'requests': route.requests,
+                'failures': route.failures,
+                'latency_ms': round(route.latency * 1000) if route.latency is not None else None,
+                'success_rate': round(route.success_rate, 2),
+                'evicted': route.evicted_until > now,
+                'blocked_by': sorted(host for host, until in route.blocked_until.items() if until > now),
+            } for route in self.routes]
+
+    def reset_stats(self):
+        """Clear the per-run counters; health and evictions carry over."""
+        with self._lock:
+            for route in self.routes:
+                route.requests = 0
+                route.failures = 0
+
+
+def _demo():
+    """Fetch a local page through stand-in proxies, one of which is blocked."""
+    import http.server
+    import urllib.request
+
+    from scraper import PriceScraper
+
+    class Origin(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = b'<div class="price">$19.95</div>'
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    def stand_in(status: Optional[int] = None, delay: float = 0.0):
+        class Proxy(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                # A proxied request carries the absolute URL as its path
+                time.sleep(delay)
+                if status is not None:
+                    self.send_response(status)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                with urllib.request.urlopen(self.path) as upstream:
+                    body = upstream.read()
+                self.send_response(upstream.status)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+        return Proxy
+
+    servers = [http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler) for handler in (
+        Origin, stand_in(), stand_in(delay=0.2), stand_in(status=403)
+    )]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    origin, *proxies = (f"http://127.0.0.1:{server.server_address[1]}" for server in servers)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    scraper = PriceScraper(delay=0.5, proxies={'urls': proxies, 'direct': False, 'evict_seconds': 60})
+    started = time.perf_counter()
+    for _ in range(12):
+        scraper.get_price(f"{origin}/product", '.price')
+    print(f"12 fetches in {time.perf_counter() - started:.1f}s with a 0.5s per-host delay")
+    for route in scraper.get_route_stats():
+        print(route)
+
+    scraper.close()
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    _demo()
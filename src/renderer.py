@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Headless-browser rendering backend for JS-rendered prices.
+
+Only items with "render": true in config.json go through the browser; all
+other items keep using the plain HTTP fetcher. Requires Playwright:
+
+    pip install playwright && playwright install chromium
+
+The renderer can be tried against any local page, e.g. a static fake shop
+served with `python -m http.server`:
+
+    python src/renderer.py http://127.0.0.1:8000/product.html ".price"
+"""
+
+import asyncio
+import sys
+import threading
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+from scraper import ScraperError
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:  # Rendering backend is optional
+    async_playwright = None
+
+
+# Resource types that never contribute to the price in the DOM
+BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font')
+
+# Analytics and ad hosts that only slow down page loads
+BLOCKED_HOSTS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'googlesyndication.com',
+    'facebook.net',
+    'hotjar.com',
+    'clarity.ms',
+    'criteo.com',
+    'bing.com',
+)
+
+
+class BrowserRenderer:
+    """
+    Renders pages in a pool of reusable headless Chromium contexts.
+
+    Playwright runs on its own event loop in a background thread, so the
+    renderer can be called from any thread. At most max_pages pages are
+    open at once; each page borrows one of the pooled browser contexts,
+    which keep their cookies between renders like a regular session.
+    """
+
+    def __init__(self, contexts: int = 2, max_pages: int = 2, timeout: int = 30,
+                 wait_until: str = 'domcontentloaded',
+                 block_resources: Iterable[str] = BLOCKED_RESOURCE_TYPES,
+                 block_hosts: Iterable[str] = BLOCKED_HOSTS):
+        if async_playwright is None:
+            raise ScraperError(
+                "Rendering requires the 'playwright' package "
+                "(pip install playwright && playwright install chromium)"
+            )
+
+        self.contexts = contexts
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.wait_until = wait_until
+        self.block_resources = frozenset(block_resources)
+        self.block_hosts = tuple(block_hosts)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name='browser-renderer',
+            daemon=True
+        )
+        self._thread.start()
+
+        try:
+            self._call(self._start())
+        except Exception as e:
+            self._stop_loop()
+            raise ScraperError(f"Failed to start browser renderer: {e}")
+
+    def _call(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the renderer loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    async def _start(self):
+        """Launch the browser and fill the context pool."""
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=True)
+        self._pool = asyncio.Queue()
+        self._pages = asyncio.Semaphore(self.max_pages)
+
+        for _ in range(self.contexts):
+            context = await self._browser.new_context(
+                ignore_https_errors=True,
+                locale='en-NZ',
+                java_script_enabled=True
+            )
+            await context.route('**/*', self._filter_request)
+            self._pool.put_nowait(context)
+
+    async def _filter_request(self, route):
+        """Abort requests for heavy resources and analytics hosts."""
+        request = route.request
+        host = urlparse(request.url).hostname or ''
+
+        if request.resource_type in self.block_resources or any(
+            host == blocked or host.endswith('.' + blocked)
+            for blocked in self.block_hosts
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _render(self, url: str, wait_for: Optional[str]) -> str:
+        """Load a page in a pooled context and return the rendered HTML."""
+        async with self._pages:
+            context = await self._pool.get()
+            try:
+                page = await context.new_page()
+                try:
+                    await page.goto(
+                        url,
+                        wait_until=self.wait_until,
+                        timeout=self.timeout * 1000
+                    )
+                    if wait_for:
+                        try:
+                            await page.wait_for_selector(
+                                wait_for,
+                                state='attached',
+                                timeout=self.timeout * 1000
+                            )
+                        except Exception:
+                            # Fall back to whatever has rendered so far
+                            pass
+                    return await page.content()
+                finally:
+                    await page.close()
+            finally:
+                self._pool.put_nowait(context)
+
+    def render(self, url: str, wait_for: Optional[str] = None) -> str:
+        """Render a page and return its HTML after client-side scripts ran."""
+        try:
+            return self._call(self._render(url, wait_for), timeout=self.timeout * 3)
+        except Exception as e:
+            raise ScraperError(f"Failed to render {url}: {e}")
+
+    async def _shutdown(self):
+        """Close all contexts, the browser and Playwright."""
+        while not self._pool.empty():
+            await self._pool.get_nowait().close()
+        await self._browser.close()
+        await self._playwright.stop()
+
+    def _stop_loop(self):
+        """Stop the background event loop and wait for its thread."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def close(self):
+        """Shut the browser down and stop the renderer thread."""
+        try:
+            self._call(self._shutdown(), timeout=self.timeout)
+        finally:
+            self._stop_loop()
+
+
+def create_renderer(renderer_config: Dict) -> BrowserRenderer:
+    """Create a BrowserRenderer from the 'scraper.renderer' config section."""
+    return BrowserRenderer(
+        contexts=renderer_config.get('contexts', 2),
+        max_pages=renderer_config.get('max_pages', 2),
+        timeout=renderer_config.get('timeout', 30),
+        wait_until=renderer_config.get('wait_until', 'domcontentloaded'),
+        block_resources=renderer_config.get('block_resources', BLOCKED_RESOURCE_TYPES),
+        block_hosts=renderer_config.get('block_hosts', BLOCKED_HOSTS)
+    )
+
+
+def main() -> int:
+    """Render a single URL and print the price found with a selector."""
+    if len(sys.argv) < 2:
+        print("Usage: python src/renderer.py <url> [css_selector]")
+        return 1
+
+    from scraper import PriceScraper
+
+    url = sys.argv[1]
+    css_selector = sys.argv[2] if len(sys.argv) > 2 else '.price'
+
+    scraper = PriceScraper()
+    scraper.renderer = BrowserRenderer(contexts=1, max_pages=1)
+    try:
+        html = scraper.fetch_page(url, render=True, wait_for=css_selector.split(',')[0].strip())
+        print(f"Rendered {len(html):,} characters")
+        print(f"Price: {scraper.extract_price(html, css_selector)}")
+    finally:
+        scraper.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
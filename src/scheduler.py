@@ -9,33 +9,16 @@ The schedule can be modified in the config file without rebuilding the container
 import os
 import sys
 import time
-import json
 import logging
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, Optional
+from typing import Optional
 from croniter import croniter
 
 # Import main price checker
-from main import main as run_price_check
-
-
-# Paths
-BASE_DIR = Path(__file__).parent.parent
-CONFIG_DIR = BASE_DIR / 'config'
-CONFIG_FILE = CONFIG_DIR / 'config.json'
-
-
-def load_config() -> Dict:
-    """Load configuration from config.json."""
-    if not CONFIG_FILE.exists():
-        raise FileNotFoundError(
-            f"Configuration file not found: {CONFIG_FILE}\n"
-            f"Please create config.json based on config.example.json"
-        )
-
-    with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+from main import main as run_price_check, get_history, run_instance
+from settings import CONFIG_FILE, load_settings
+import sharding
+import status
 
 
 def validate_cron_expression(cron_expr: str) -> bool:
@@ -96,13 +79,13 @@ def run_scheduler():
 
     # Load configuration
     try:
-        config = load_config()
+        settings = load_settings()
     except Exception as e:
         logging.error(f"Failed to load configuration: {e}")
         return 1
 
     # Get schedule settings
-    schedule_config = config.get("schedule", {})
+    schedule_config = settings.schedule
 
     if not schedule_config.get("enabled", True):
         logging.warning("Scheduler is disabled in configuration!")
@@ -129,10 +112,19 @@ def run_scheduler():
     logging.info(f"Run on startup: {run_on_startup}")
     logging.info("")
 
+    # Serve the latest prices locally, warmed from the price history
+    status.start(settings.status, settings.items, get_history())
+
+    # A run cut short by a crash or redeploy is resumed right away
+    if get_history().unfinished_run(run_instance()) is not None:
+        logging.info("Previous check was interrupted; resuming it now")
+        run_on_startup = True
+
     run_count = 0
 
     # Calculate next run time
     next_run = get_next_run_time(cron_expr)
+    status.set_next_check(next_run)
     logging.info(f"Next check scheduled for: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
     logging.info(f"Time until next check: {format_time_until(next_run)}")
     logging.info("")
@@ -146,7 +138,7 @@ def run_scheduler():
             logging.info("-" * 70)
 
             try:
-                exit_code = run_price_check()
+                exit_code = run_price_check(startup=True)
                 if exit_code != 0:
                     logging.error(f"Price check completed with errors (exit code: {exit_code})")
                 else:
@@ -159,6 +151,7 @@ def run_scheduler():
 
             # Recalculate next run after startup check
             next_run = get_next_run_time(cron_expr)
+            status.set_next_check(next_run)
             logging.info(f"Next scheduled check: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
             logging.info(f"Time until next check: {format_time_until(next_run)}")
             logging.info("")
@@ -188,6 +181,7 @@ def run_scheduler():
 
                 # Calculate next run time
                 next_run = get_next_run_time(cron_expr)
+                status.set_next_check(next_run)
                 logging.info(f"Next scheduled check: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
                 logging.info(f"Time until next check: {format_time_until(next_run)}")
                 logging.info("")
@@ -196,6 +190,9 @@ def run_scheduler():
             # This allows for config reloading in the future if needed
             time.sleep(30)  # Check every 30 seconds
 
+            # Keep this instance in the shard ring between runs
+            sharding.heartbeat()
+
     except KeyboardInterrupt:
         logging.info("")
         logging.info("Scheduler stopped by user (Ctrl+C)")
@@ -204,6 +201,9 @@ def run_scheduler():
     except Exception as e:
         logging.error(f"Fatal error in scheduler: {e}", exc_info=True)
         return 1
+    finally:
+        sharding.shutdown()
+        status.stop()
 
 
 if __name__ == '__main__':
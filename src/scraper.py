@@ -1,23 +1,144 @@
 import re
+import json
 import time
 import ssl
 import warnings
 import random
 import cloudscraper
+from cloudscraper.exceptions import CloudflareException
 from bs4 import BeautifulSoup
-from typing import Optional
-from requests.exceptions import RequestException
-from requests.adapters import HTTPAdapter
-from urllib.parse import urlparse
+from lxml import etree
+from lxml.cssselect import CSSSelector
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from http.client import HTTPMessage
+from types import SimpleNamespace
+from requests import Response
+from requests.exceptions import ConnectionError, RequestException, Timeout
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
 from urllib3.exceptions import InsecureRequestWarning
 from urllib3.poolmanager import PoolManager
+from urllib3.util.request import ACCEPT_ENCODING
 import urllib3
 
+from prices import PriceParser, price_parser
+from proxies import ProxyPool, Route, is_blocked
+
+try:
+    import httpx
+except ImportError:  # HTTP/2 transport is optional
+    httpx = None
+
 # Disable SSL warnings globally
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 warnings.filterwarnings('ignore', category=InsecureRequestWarning)
 
 
+# Common patterns for prices in JS
+SCRIPT_PRICE_PATTERNS = [
+    re.compile(r'"price"\s*:\s*(\d+(?:\.\d+)?)'),
+    re.compile(r"'price'\s*:\s*(\d+(?:\.\d+)?)"),
+    re.compile(r'"Price"\s*:\s*(\d+(?:\.\d+)?)'),
+    re.compile(r'price\s*=\s*["\']?(\d+(?:\.\d+)?)'),
+    re.compile(r'data-price=["\']?(\d+(?:\.\d+)?)'),
+]
+
+# Query parameters that never change the page content
+TRACKING_PARAMS = {'ref', 'ref_', 'tag', 'fbclid', 'gclid', 'msclkid', 'mc_cid', 'mc_eid'}
+
+CHARSET_PATTERN = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalise a product URL so equivalent URLs compare equal.
+
+    Lowercases scheme and host, drops default ports, fragments, trailing
+    slashes and tracking parameters, and sorts the remaining query.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or '').lower()
+    if parsed.port and (scheme, parsed.port) not in (('http', 80), ('https', 443)):
+        host = f"{host}:{parsed.port}"
+
+    path = parsed.path.rstrip('/') or '/'
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    ))
+
+    return urlunparse((scheme, host, path, '', query, ''))
+
+
+def normalize_fields(fields: Dict) -> Dict[str, Dict]:
+    """
+    Expand a fields mapping into full extraction specs.
+
+    Values may be a selector string or {"selector": ..., "type": ...,
+    "locale": ...}; type is "number" (default) or "text", and locale sets
+    the number format of a number field (see prices.py).
+    """
+    specs = {}
+    for name, spec in fields.items():
+        if isinstance(spec, str):
+            spec = {'selector': spec}
+        specs[name] = {'selector': spec['selector'], 'type': spec.get('type', 'number')}
+        if spec.get('locale'):
+            specs[name]['locale'] = spec['locale']
+    return specs
+
+
+def _declared_charset(response: Response) -> Optional[str]:
+    """Return the charset declared in the Content-Type header, if any."""
+    match = CHARSET_PATTERN.search(response.headers.get('Content-Type', ''))
+    return match.group(1) if match else None
+
+
+def _is_complete(element) -> bool:
+    """
+    Check whether an element of a partially parsed tree has been closed.
+
+    The parser has moved past an element once it or one of its ancestors
+    has a following sibling.
+    """
+    while element is not None:
+        if element.getnext() is not None:
+            return True
+        element = element.getparent()
+    return False
+
+
+def _price_from_json_ld(text: Optional[str]) -> Optional[float]:
+    """Extract the offer price from a JSON-LD structured data block."""
+    if not text:
+        return None
+
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+
+    stack: List = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            if node.get('@type') in ('Offer', 'AggregateOffer'):
+                for key in ('price', 'lowPrice'):
+                    try:
+                        return float(node[key])
+                    except (KeyError, TypeError, ValueError):
+                        continue
+            stack.extend(reversed(list(node.values())))
+
+    return None
+
+
 class SSLAdapter(HTTPAdapter):
     """Custom adapter to bypass SSL verification."""
     def init_poolmanager(self, *args, **kwargs):
@@ -33,17 +154,331 @@ class SSLAdapter(HTTPAdapter):
         """Override to disable certificate verification."""
         super().cert_verify(conn, url, verify=False, cert=cert)
 
+    def connection_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return opened connections vs. requests served per host pool."""
+        stats = {}
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats[pool.host] = {
+                'connections': pool.num_connections,
+                'requests': pool.num_requests,
+                'reused': max(pool.num_requests - pool.num_connections, 0),
+            }
+        return stats
+
+
+class _HttpxBody:
+    """File-like wrapper exposing an httpx response the way requests expects."""
+
+    def __init__(self, upstream):
+        self.upstream = upstream
+        # Lets requests copy Set-Cookie headers into the session cookie jar
+        msg = HTTPMessage()
+        for name, value in upstream.headers.multi_items():
+            msg[name] = value
+        self._original_response = SimpleNamespace(msg=msg)
+
+    def stream(self, chunk_size: int = 1024, decode_content: bool = True):
+        yield from self.upstream.iter_bytes(chunk_size)
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self.upstream.read()
+
+    def tell(self) -> int:
+        return self.upstream.num_bytes_downloaded
+
+    def close(self):
+        self.upstream.close()
+
+    release_conn = close
+
+
+class Http2Adapter(BaseAdapter):
+    """Transport adapter that sends requests through an HTTP/2-capable httpx client."""
+
+    def __init__(self, max_connections: int = 10):
+        super().__init__()
+        if httpx is None:
+            raise ScraperError("HTTP/2 support requires the 'httpx[http2]' package")
+        self.client = httpx.Client(
+            http2=True,
+            verify=False,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
+        self.requests_sent: Dict[str, int] = defaultdict(int)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """Send a prepared requests.Request over httpx and wrap the result."""
+        # requests passes a (connect, read) tuple, or one value for every phase
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        else:
+            timeout = httpx.Timeout(timeout)
+
+        try:
+            upstream = self.client.send(
+                self.client.build_request(
+                    request.method,
+                    request.url,
+                    headers=dict(request.headers),
+                    content=request.body,
+                    timeout=timeout
+                ),
+                stream=True
+            )
+        except httpx.TimeoutException as e:
+            raise Timeout(e, request=request)
+        except httpx.HTTPError as e:
+            raise ConnectionError(e, request=request)
+        finally:
+            # The requests session owns cookies; don't resend them twice
+            self.client.cookies.clear()
+
+        self.requests_sent[urlparse(request.url).hostname] += 1
+
+        response = Response()
+        response.status_code = upstream.status_code
+        response.headers = CaseInsensitiveDict(upstream.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = _HttpxBody(upstream)
+        response.reason = upstream.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        self.client.close()
+
+    def connection_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return requests served per host (connections are multiplexed)."""
+        return {host: {'requests': count} for host, count in self.requests_sent.items()}
+
+
+class PageExtractor:
+    """
+    Extracts prices and other fields from parsed HTML.
+
+    Holds no network state, so it can also run inside parser worker
+    processes (see parsing.py).
+    """
+
+    def extract_price(self, html: Union[str, bytes], css_selector: str,
+                      encoding: Optional[str] = None) -> Optional[float]:
+        """
+        Extract price from HTML using CSS selector.
+
+        Raw bytes are handed straight to lxml, decoded with the declared
+        charset when one is given.
+        """
+        return self.select_price(self.parse(html, encoding), css_selector)
+
+    def parse(self, html: Union[str, bytes], encoding: Optional[str] = None) -> BeautifulSoup:
+        """Parse HTML (str or raw bytes) into a BeautifulSoup document."""
+        if isinstance(html, bytes):
+            return BeautifulSoup(html, 'lxml', from_encoding=encoding)
+        return BeautifulSoup(html, 'lxml')
+
+    def select_price(self, soup: BeautifulSoup, css_selector: str,
+                     script_fallback: bool = True, locale: Optional[str] = None) -> Optional[float]:
+        """
+        Extract price from an already parsed document using CSS selector.
+
+        'locale' picks the number format of the price text (see prices.py);
+        without it the decimal separator is guessed.
+        """
+        parser = price_parser(locale)
+
+        # Try multiple selectors if comma-separated
+        selectors = [s.strip() for s in css_selector.split(',')]
+
+        for selector in selectors:
+            elements = soup.select(selector)
+            for element in elements:
+                price = self._price_from_tag(element, parser)
+                if price is not None:
+                    return price
+
+        # Fallback: search for price patterns in script tags (for JS-rendered prices)
+        if script_fallback:
+            return self._extract_from_scripts(soup)
+
+        return None
+
+    def select_text(self, soup: BeautifulSoup, css_selector: str) -> Optional[str]:
+        """Return the text of the first matching element that has any."""
+        for selector in (s.strip() for s in css_selector.split(',')):
+            for element in soup.select(selector):
+                text = element.get_text(' ', strip=True) or element.get('content', '').strip()
+                if text:
+                    return text
+
+        return None
+
+    def extract_fields(self, soup: BeautifulSoup,
+                       fields: Dict[str, Dict]) -> Dict[str, Union[float, str, None]]:
+        """
+        Extract several named fields from one parsed document.
+
+        Each field spec has a 'selector', a 'type' ('number' or 'text') and
+        optionally 'script_fallback' to search script tags for numbers and
+        'locale' for the number format.
+        """
+        values = {}
+        for name, spec in fields.items():
+            if spec.get('type', 'number') == 'text':
+                values[name] = self.select_text(soup, spec['selector'])
+            else:
+                values[name] = self.select_price(
+                    soup,
+                    spec['selector'],
+                    script_fallback=spec.get('script_fallback', False),
+                    locale=spec.get('locale')
+                )
+        return values
+
+    def _price_from_tag(self, element, parser: PriceParser) -> Optional[float]:
+        """Read a price from a matched BeautifulSoup element."""
+        # Structured data: JSON-LD blocks are parsed, not scraped as text
+        if element.name == 'script':
+            if element.get('type') == 'application/ld+json':
+                return _price_from_json_ld(element.string)
+            return None
+
+        price = parser.parse(element.get_text())
+        if price is not None:
+            return price
+
+        # Check for data-price attribute, then microdata/OpenGraph content
+        for attr in ('data-price', 'content'):
+            if element.has_attr(attr):
+                price = parser.parse(element[attr])
+                if price is not None:
+                    return price
+
+        return None
+
+    def _price_from_elements(self, elements: Iterable, parser: PriceParser) -> Optional[float]:
+        """Return the first price found in a sequence of lxml elements."""
+        for element in elements:
+            if element.tag == 'script':
+                if element.get('type') == 'application/ld+json':
+                    price = _price_from_json_ld(element.text)
+                    if price is not None:
+                        return price
+                continue
 
-class PriceScraper:
+            price = parser.parse(''.join(element.itertext()))
+            if price is not None:
+                return price
+
+            # Check for data-price attribute, then microdata/OpenGraph content
+            for attr in ('data-price', 'content'):
+                price = parser.parse(element.get(attr))
+                if price is not None:
+                    return price
+
+        return None
+
+    def _extract_from_scripts(self, soup: BeautifulSoup) -> Optional[float]:
+        """Try to extract price from JavaScript data in the page."""
+        return self._price_from_script_texts(
+            script.string for script in soup.find_all('script')
+        )
+
+    def _price_from_script_texts(self, texts: Iterable[Optional[str]]) -> Optional[float]:
+        """Search script bodies for common JS price patterns."""
+        for text in texts:
+            if text:
+                for pattern in SCRIPT_PRICE_PATTERNS:
+                    match = pattern.search(text)
+                    if match:
+                        try:
+                            return float(match.group(1))
+                        except ValueError:
+                            continue
+
+        return None
+
+    def extract_listing_rows(self, soup: BeautifulSoup, base_url: str, row_selector: str,
+                             fields: Dict[str, Dict], link_selector: str = 'a[href]',
+                             sku_selector: Optional[str] = None,
+                             sku_attribute: Optional[str] = None) -> List[Dict]:
+        """Extract one row (url, sku, fields) per product element of a listing page."""
+        rows = []
+
+        for element in soup.select(row_selector):
+            link = element.select_one(link_selector)
+            product_url = None
+            if link is not None and link.get('href'):
+                product_url = normalize_url(urljoin(base_url, link['href']))
+
+            sku = None
+            sku_element = element.select_one(sku_selector) if sku_selector else element
+            if sku_element is not None:
+                if sku_attribute:
+                    sku = sku_element.get(sku_attribute)
+                elif sku_selector:
+                    sku = sku_element.get_text(strip=True)
+
+            rows.append({
+                'url': product_url,
+                'sku': sku.strip() if sku else None,
+                'fields': self.extract_fields(element, fields)
+            })
+
+        return rows
+
+
+class PriceScraper(PageExtractor):
     """Scrapes prices from product pages."""
 
-    def __init__(self, timeout: int = 30, delay: float = 2.0):
+    def __init__(self, timeout: int = 30, delay: float = 2.0, stream: bool = False,
+                 max_body_bytes: int = 5 * 1024 * 1024, chunk_size: int = 64 * 1024,
+                 pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False,
+                 host_pools: Optional[Dict[str, int]] = None, http2: bool = False,
+                 proxies: Optional[Dict] = None):
         self.timeout = timeout
         self.delay = delay
-        self.last_request_time = 0
+        # Streaming mode stops downloading as soon as the price is found
+        self.stream = stream
+        self.max_body_bytes = max_body_bytes
+        self.chunk_size = chunk_size
+        # Per-host transfer counters: wire (compressed) vs decoded body bytes
+        self.stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {'requests': 0, 'wire_bytes': 0, 'body_bytes': 0}
+        )
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.host_pools = host_pools or {}
+        self.http2 = http2
+        # Egress routes: the direct connection plus any proxies, each with
+        # its own session and per-host request slots (see proxies.py)
+        proxies = proxies or {}
+        self.routes = ProxyPool(
+            proxies.get('urls', []),
+            direct=proxies.get('direct', True),
+            delay=delay,
+            evict_seconds=proxies.get('evict_seconds', 1800),
+            max_failures=proxies.get('max_failures', 3)
+        )
+        self.session = self._route_session(self.routes.direct)
+        # Optional headless-browser backend for JS-rendered items
+        self.renderer = None
+
+    def _create_session(self, proxy: Optional[str] = None):
+        """Create an HTTP session with our adapters, optionally through a proxy."""
         # cloudscraper automatically handles Cloudflare challenges
         # and sets appropriate headers
-        self.session = cloudscraper.create_scraper(
+        session = cloudscraper.create_scraper(
             browser={
                 'browser': 'chrome',
                 'platform': 'windows',
@@ -52,27 +487,69 @@ class PriceScraper:
             delay=10  # Delay between solving challenges
         )
         # Disable SSL verification at session level
-        self.session.verify = False
+        session.verify = False
+        if proxy:
+            session.proxies = {'http': proxy, 'https': proxy}
+
+        # HTTP/2 goes out directly; proxied routes use HTTP/1.1 pools
+        http2 = self.http2 and not proxy
 
         # Mount custom SSL adapter for both http and https
-        adapter = SSLAdapter()
-        self.session.mount('https://', adapter)
-        self.session.mount('http://', adapter)
-
-    def _rate_limit(self):
-        """Ensure minimum delay between requests."""
-        if self.last_request_time > 0:
-            elapsed = time.time() - self.last_request_time
-            if elapsed < self.delay:
-                time.sleep(self.delay - elapsed)
-        self.last_request_time = time.time()
-
-    def _warmup_pbtech_session(self, homepage: str):
+        if http2:
+            adapter = Http2Adapter(max_connections=self.pool_maxsize)
+        else:
+            adapter = SSLAdapter(
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                pool_block=self.pool_block
+            )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        # Dedicated pools for hosts that need more (or fewer) connections;
+        # requests picks the adapter with the longest matching prefix
+        for host, maxsize in self.host_pools.items():
+            if http2:
+                host_adapter = Http2Adapter(max_connections=maxsize)
+            else:
+                host_adapter = SSLAdapter(
+                    pool_connections=1,
+                    pool_maxsize=maxsize,
+                    pool_block=self.pool_block
+                )
+            session.mount(f'https://{host}/', host_adapter)
+            session.mount(f'http://{host}/', host_adapter)
+
+        return session
+
+    def _route_session(self, route: Route):
+        """Return a route's session, creating it on first use."""
+        if route.session is None:
+            route.session = self._create_session(route.proxy)
+        return route.session
+
+    def _rate_limit(self, host: str = ''):
+        """Ensure minimum delay between direct requests to the same host."""
+        wait = self.routes.reserve(self.routes.direct, host)
+        if wait > 0:
+            time.sleep(wait)
+
+    def _acquire_route(self, host: str) -> Route:
+        """Pick the egress route for a request and wait for its slot."""
+        acquired = self.routes.acquire(host)
+        if acquired is None:
+            raise ScraperError(f"No usable route to {host}: every route is evicted")
+        route, wait = acquired
+        if wait > 0:
+            time.sleep(wait)
+        return route
+
+    def _warmup_pbtech_session(self, session, homepage: str):
         """Build a realistic browsing session for PBTech before accessing product."""
         try:
             # Visit homepage first
             time.sleep(random.uniform(1.0, 2.0))
-            self.session.get(homepage, timeout=self.timeout, verify=False)
+            session.get(homepage, timeout=self.timeout, verify=False)
             time.sleep(random.uniform(1.5, 3.0))
 
             # Visit a category page to look more human
@@ -82,58 +559,94 @@ class PriceScraper:
                 f"{homepage}/peripherals"
             ]
             category = random.choice(category_urls)
-            self.session.get(category, timeout=self.timeout, verify=False)
+            session.get(category, timeout=self.timeout, verify=False)
             time.sleep(random.uniform(1.0, 2.5))
         except:
             # If warmup fails, continue anyway
             pass
 
-    def fetch_page(self, url: str, retries: int = 3) -> Optional[str]:
-        """Fetch the HTML content of a page with retry logic."""
-        self._rate_limit()
-
+    def _build_headers(self, parsed) -> dict:
+        """Prepare realistic browser headers for a request."""
+        return {
+            'Referer': f"{parsed.scheme}://{parsed.netloc}/",
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+            'Accept-Language': 'en-NZ,en-GB;q=0.9,en-US;q=0.8,en;q=0.7',
+            # Every encoding urllib3 can decode here (br/zstd when installed)
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'DNT': '1',
+            'Upgrade-Insecure-Requests': '1',
+            'Sec-Fetch-Dest': 'document',
+            'Sec-Fetch-Mode': 'navigate',
+            'Sec-Fetch-Site': 'same-origin',
+            'Sec-Fetch-User': '?1',
+            'Sec-CH-UA': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+            'Sec-CH-UA-Mobile': '?0',
+            'Sec-CH-UA-Platform': '"Windows"',
+        }
+
+    def _get(self, url: str, retries: int = 3, stream: bool = False) -> Response:
+        """
+        GET a page with retry logic and return the response.
+
+        Each attempt goes out through the route picked by the proxy pool,
+        so a retry after a block or a dead proxy uses another route.
+        """
         parsed = urlparse(url)
-        is_pbtech = 'pbtech.co.nz' in parsed.netloc
+        host = parsed.netloc
+
+        is_pbtech = 'pbtech.co.nz' in host
 
         for attempt in range(retries):
+            route = self._acquire_route(host)
+            session = self._route_session(route)
             try:
-                # For PBTech, build a realistic session on first attempt
-                if is_pbtech and attempt == 0:
-                    homepage = f"{parsed.scheme}://{parsed.netloc}"
-                    self._warmup_pbtech_session(homepage)
-
-                # Prepare more realistic headers
-                headers = {
-                    'Referer': f"{parsed.scheme}://{parsed.netloc}/",
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-                    'Accept-Language': 'en-NZ,en-GB;q=0.9,en-US;q=0.8,en;q=0.7',
-                    'DNT': '1',
-                    'Upgrade-Insecure-Requests': '1',
-                    'Sec-Fetch-Dest': 'document',
-                    'Sec-Fetch-Mode': 'navigate',
-                    'Sec-Fetch-Site': 'same-origin',
-                    'Sec-Fetch-User': '?1',
-                    'Sec-CH-UA': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
-                    'Sec-CH-UA-Mobile': '?0',
-                    'Sec-CH-UA-Platform': '"Windows"',
-                }
+                # For PBTech, build a realistic session once per route; the
+                # route's cookie jar keeps it for later requests
+                if is_pbtech and host not in route.warmed:
+                    homepage = f"{parsed.scheme}://{host}"
+                    self._warmup_pbtech_session(session, homepage)
+                    route.warmed.add(host)
+
+                headers = self._build_headers(parsed)
 
                 # For PBTech, add a small random delay before request
                 if is_pbtech:
                     time.sleep(random.uniform(0.5, 1.5))
 
                 # Explicitly pass verify=False to bypass SSL verification
-                response = self.session.get(
+                response = session.get(
                     url,
                     timeout=self.timeout,
                     verify=False,
-                    headers=headers
+                    headers=headers,
+                    stream=stream
                 )
+                blocked = is_blocked(response.status_code, response.headers)
+                # A 404 or 500 is the page's fault, not the route's
+                self.routes.report(route, host, ok=not blocked,
+                                   latency=response.elapsed.total_seconds(), blocked=blocked)
                 response.raise_for_status()
-                return response.text
+                return response
+
+            except (RequestException, CloudflareException) as e:
+                if isinstance(e, CloudflareException):
+                    # cloudscraper could not get past a challenge
+                    route_failed = True
+                    self.routes.report(route, host, ok=False, blocked=True)
+                elif isinstance(e, (ConnectionError, Timeout)):
+                    route_failed = True
+                    self.routes.report(route, host, ok=False)
+                else:
+                    # Blocks were already reported when the response came in
+                    route_failed = e.response is not None and is_blocked(
+                        e.response.status_code, e.response.headers
+                    )
 
-            except RequestException as e:
                 if attempt < retries - 1:
+                    # The next attempt goes out through another route when
+                    # there is one, so there is nothing to back off from
+                    if route_failed and len(self.routes.routes) > 1:
+                        continue
                     # Randomized exponential backoff for PBTech
                     if is_pbtech:
                         base_wait = (attempt + 1) * 5
@@ -144,100 +657,228 @@ class PriceScraper:
                 else:
                     raise ScraperError(f"Failed to fetch {url}: {e}")
 
-        return None
+        raise ScraperError(f"Failed to fetch {url}: no attempts made")
 
-    def extract_price(self, html: str, css_selector: str) -> Optional[float]:
-        """Extract price from HTML using CSS selector."""
-        soup = BeautifulSoup(html, 'lxml')
-
-        # Try multiple selectors if comma-separated
-        selectors = [s.strip() for s in css_selector.split(',')]
-
-        for selector in selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                price = self._parse_price_text(element.get_text())
-                if price is not None:
-                    return price
-
-                # Check for data-price attribute
-                if element.has_attr('data-price'):
-                    price = self._parse_price_text(element['data-price'])
+    def _record_transfer(self, url: str, response: Response, body_bytes: int):
+        """Record compressed and decompressed byte counts for a response."""
+        try:
+            wire_bytes = response.raw.tell()
+        except (AttributeError, OSError):
+            wire_bytes = body_bytes
+
+        host_stats = self.stats[urlparse(url).netloc]
+        host_stats['requests'] += 1
+        host_stats['wire_bytes'] += wire_bytes
+        host_stats['body_bytes'] += body_bytes
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return a copy of the per-host transfer stats."""
+        return {host: dict(counters) for host, counters in self.stats.items()}
+
+    def reset_stats(self):
+        """Clear the per-host transfer and per-route stats, e.g. at the start of a run."""
+        self.stats.clear()
+        self.routes.reset_stats()
+
+    def get_route_stats(self) -> List[Dict]:
+        """Return the health and request counts of every egress route."""
+        return self.routes.stats()
+
+    def get_connection_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return connection reuse stats per host across all mounted adapters."""
+        stats = {}
+        seen = set()
+        for route in self.routes.all_routes:
+            if route.session is None:
+                continue
+            for adapter in route.session.adapters.values():
+                if id(adapter) in seen or not hasattr(adapter, 'connection_stats'):
+                    continue
+                seen.add(id(adapter))
+                for host, counters in adapter.connection_stats().items():
+                    totals = stats.setdefault(host, dict.fromkeys(counters, 0))
+                    for name, count in counters.items():
+                        totals[name] = totals.get(name, 0) + count
+        return stats
+
+    def fetch_content(self, url: str, retries: int = 3) -> Tuple[bytes, Optional[str]]:
+        """Fetch the raw body of a page and its declared charset."""
+        response = self._get(url, retries)
+        content = response.content
+        self._record_transfer(url, response, len(content))
+        return content, _declared_charset(response)
+
+    def fetch_page(self, url: str, retries: int = 3, render: bool = False,
+                   wait_for: Optional[str] = None) -> Optional[str]:
+        """
+        Fetch the HTML content of a page with retry logic.
+
+        With render=True the page is loaded in the headless browser backend
+        instead, optionally waiting for the wait_for selector to appear.
+        """
+        if render:
+            if self.renderer is None:
+                raise ScraperError(f"Cannot render {url}: no browser renderer configured")
+            self._rate_limit(urlparse(url).netloc)
+            return self.renderer.render(url, wait_for)
+
+        response = self._get(url, retries)
+        self._record_transfer(url, response, len(response.content))
+        return response.text
+
+    def fetch_and_extract(self, url: str, css_selector: str, retries: int = 3,
+                          locale: Optional[str] = None) -> Optional[float]:
+        """
+        Stream a page and extract the price while it downloads.
+
+        The body is fed chunk by chunk into an incremental lxml parser. The
+        connection is closed as soon as the first configured selector yields
+        a price, or once max_body_bytes have been read. A JSON-LD offer seen
+        on the way is only used when every selector misses, unless a
+        selector picks the JSON-LD block itself.
+        """
+        response = self._get(url, retries, stream=True)
+        price_text = price_parser(locale)
+        bytes_read = 0
+        try:
+            try:
+                parser = etree.HTMLPullParser(
+                    events=('start', 'end'),
+                    tag=('html', 'script'),
+                    encoding=_declared_charset(response)
+                )
+            except LookupError:
+                # Charset unknown to lxml (e.g. "utf8mb4"); let it detect one
+                parser = etree.HTMLPullParser(events=('start', 'end'), tag=('html', 'script'))
+            selectors = [CSSSelector(s.strip()) for s in css_selector.split(',')]
+            root = None
+            json_ld_price = None
+
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                parser.feed(chunk)
+                bytes_read += len(chunk)
+
+                for event, element in parser.read_events():
+                    if event == 'start' and root is None:
+                        root = element
+                    elif event == 'end' and element.tag == 'script' and json_ld_price is None:
+                        if element.get('type') == 'application/ld+json':
+                            json_ld_price = _price_from_json_ld(element.text)
+
+                # Only the highest-priority selector is confident mid-stream;
+                # later selectors must wait for the whole (capped) document
+                if root is not None:
+                    price = self._price_from_elements(
+                        (e for e in selectors[0](root) if _is_complete(e)), price_text
+                    )
                     if price is not None:
                         return price
 
-        # Fallback: search for price patterns in script tags (for JS-rendered prices)
-        price = self._extract_from_scripts(soup)
-        if price is not None:
-            return price
-
-        return None
-
-    def _parse_price_text(self, text: str) -> Optional[float]:
-        """Parse a price string and return the numeric value."""
-        if not text:
-            return None
+                if bytes_read >= self.max_body_bytes:
+                    break
 
-        # Remove currency symbols and whitespace
-        cleaned = re.sub(r'[^\d.,]', '', text.strip())
-
-        if not cleaned:
-            return None
-
-        # Handle different number formats
-        # Format: 1,234.56 or 1.234,56 or 1234
-        if ',' in cleaned and '.' in cleaned:
-            # Determine which is decimal separator
-            if cleaned.rfind(',') > cleaned.rfind('.'):
-                # European format: 1.234,56
-                cleaned = cleaned.replace('.', '').replace(',', '.')
-            else:
-                # US format: 1,234.56
-                cleaned = cleaned.replace(',', '')
-        elif ',' in cleaned:
-            # Could be thousands separator or decimal
-            parts = cleaned.split(',')
-            if len(parts) == 2 and len(parts[1]) == 2:
-                # Likely decimal: 123,45
-                cleaned = cleaned.replace(',', '.')
-            else:
-                # Thousands separator: 1,234 or 12,345
-                cleaned = cleaned.replace(',', '')
+            try:
+                root = parser.close()
+            except etree.XMLSyntaxError:
+                pass
+            if root is None:
+                return json_ld_price
+
+            for selector in selectors:
+                price = self._price_from_elements(selector(root), price_text)
+                if price is not None:
+                    return price
 
-        try:
-            return float(cleaned)
-        except ValueError:
-            return None
+            if json_ld_price is not None:
+                return json_ld_price
+
+            return self._price_from_script_texts(
+                script.text for script in root.iter('script')
+            )
+        finally:
+            self._record_transfer(url, response, bytes_read)
+            response.close()
+
+    def close(self):
+        """Close the HTTP sessions and the browser renderer, if any."""
+        for route in self.routes.all_routes:
+            if route.session is not None:
+                route.session.close()
+                route.session = None
+        if self.renderer is not None:
+            self.renderer.close()
+            self.renderer = None
+
+    def fetch_document(self, url: str, render: bool = False,
+                       wait_for: Optional[str] = None) -> Tuple[Union[str, bytes], Optional[str]]:
+        """Fetch (or render) a page and return its unparsed body and charset."""
+        if render:
+            first_selector = wait_for.split(',')[0].strip() if wait_for else None
+            return self.fetch_page(url, render=True, wait_for=first_selector), None
+
+        return self.fetch_content(url)
+
+    def load_document(self, url: str, render: bool = False,
+                      wait_for: Optional[str] = None) -> BeautifulSoup:
+        """Fetch (or render) a page and parse it."""
+        return self.parse(*self.fetch_document(url, render, wait_for))
+
+    def streams(self, field_sets: List[Dict[str, Dict]], render: bool = False) -> bool:
+        """Whether get_fields can stream this page and stop the download early."""
+        if render or not self.stream or len(field_sets) != 1 or len(field_sets[0]) != 1:
+            return False
+        spec = next(iter(field_sets[0].values()))
+        return spec.get('type', 'number') == 'number'
+
+    def get_listing_rows(self, url: str, row_selector: str, fields: Dict[str, Dict],
+                         link_selector: str = 'a[href]', sku_selector: Optional[str] = None,
+                         sku_attribute: Optional[str] = None, render: bool = False) -> List[Dict]:
+        """
+        Fetch a category/search page once and extract one row per product.
+
+        Every row gets its normalised product 'url' (from link_selector),
+        an optional 'sku' and the 'fields' values, with selectors evaluated
+        relative to the row element.
+        """
+        soup = self.load_document(url, render, wait_for=row_selector)
+        return self.extract_listing_rows(
+            soup, url, row_selector, fields, link_selector, sku_selector, sku_attribute
+        )
 
-    def _extract_from_scripts(self, soup: BeautifulSoup) -> Optional[float]:
-        """Try to extract price from JavaScript data in the page."""
-        scripts = soup.find_all('script')
-
-        # Common patterns for prices in JS
-        patterns = [
-            r'"price"\s*:\s*(\d+(?:\.\d+)?)',
-            r"'price'\s*:\s*(\d+(?:\.\d+)?)",
-            r'"Price"\s*:\s*(\d+(?:\.\d+)?)',
-            r'price\s*=\s*["\']?(\d+(?:\.\d+)?)',
-            r'data-price=["\']?(\d+(?:\.\d+)?)',
+    def get_fields(self, url: str, field_sets: List[Dict[str, Dict]],
+                   render: bool = False) -> List[Dict[str, Union[float, str, None]]]:
+        """
+        Fetch and parse a page once and extract every field set from it.
+
+        field_sets holds one {field name: spec} mapping per item sharing the
+        page (see extract_fields). Returns one dict of values per field set.
+        """
+        if self.streams(field_sets, render):
+            # A single numeric field can stop the download early
+            (name, spec), = field_sets[0].items()
+            return [{name: self.fetch_and_extract(url, spec['selector'], locale=spec.get('locale'))}]
+
+        first_spec = next(iter(field_sets[0].values()))
+        soup = self.load_document(url, render, wait_for=first_spec['selector'])
+
+        return [self.extract_fields(soup, fields) for fields in field_sets]
+
+    def get_prices(self, url: str, css_selectors: List[str],
+                   render: bool = False) -> List[Optional[float]]:
+        """
+        Fetch a page once and extract a price for each selector.
+
+        Returns one entry per selector, None where no price was found.
+        """
+        field_sets = [
+            {'price': {'selector': css_selector, 'script_fallback': True}}
+            for css_selector in css_selectors
         ]
+        return [values['price'] for values in self.get_fields(url, field_sets, render)]
 
-        for script in scripts:
-            if script.string:
-                for pattern in patterns:
-                    match = re.search(pattern, script.string)
-                    if match:
-                        try:
-                            return float(match.group(1))
-                        except ValueError:
-                            continue
-
-        return None
-
-    def get_price(self, url: str, css_selector: str) -> float:
+    def get_price(self, url: str, css_selector: str, render: bool = False) -> float:
         """Fetch a page and extract the price."""
-        html = self.fetch_page(url)
-        price = self.extract_price(html, css_selector)
+        price = self.get_prices(url, [css_selector], render)[0]
 
         if price is None:
             raise ScraperError(f"Could not extract price from {url}")
@@ -0,0 +1,457 @@
+"""
+Configuration model for SaleNotificator.
+
+config.json is read, validated and turned into typed objects in one place,
+shared by the checker, the scheduler and the notifier:
+
+- every tracked item becomes a TrackedItem with its defaults applied and
+  its extraction spec, history key and alert rules worked out up front;
+- the email section becomes an EmailSettings;
+- the other sections stay plain dicts, checked for their types.
+
+Every problem in the file is reported at once as a ConfigError. The parsed
+settings are cached and only rebuilt when the file changes, so a run that
+finds the config unchanged pays for one stat() call.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from croniter import croniter
+
+from prices import resolve_locale
+from scraper import normalize_fields, normalize_url
+
+
+# Paths
+BASE_DIR = Path(__file__).parent.parent
+CONFIG_DIR = BASE_DIR / 'config'
+CONFIG_FILE = CONFIG_DIR / 'config.json'
+
+# Alert rule conditions on any extracted field (evaluated in main.py)
+FIELD_RULES = ('below', 'above', 'equals', 'contains', 'not_contains')
+
+# Alert rules on the tracked parameter's own history (see analytics.py)
+HISTORY_RULES = ('new_low', 'below_median', 'volatility_spike')
+
+# Sections that are passed on as dicts to the module that owns them
+SECTIONS = ('schedule', 'scraper', 'parsing', 'sharding', 'logging', 'status')
+
+
+class ConfigError(ValueError):
+    """Raised when config.json is missing required values or has wrong types."""
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class EmailSettings:
+    """SMTP settings for alert emails."""
+    smtp_server: str
+    smtp_port: int
+    sender_email: str
+    sender_password: str
+    recipient_email: str
+    use_tls: bool = True
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class TrackedItem:
+    """A tracked product with every default applied."""
+    name: str
+    url: str
+    # History and status key: 'id', or else the name
+    key: str
+    # Normalised URL, shared by items on the same page
+    page_url: str
+    host: str
+    parameter: str
+    threshold: Optional[float]
+    currency: str
+    enabled: bool
+    render: bool
+    sku: Optional[str]
+    weight: float
+    # Extraction spec handed to the scraper: {name: {"selector", "type", ...}}
+    fields: Dict[str, Dict]
+    # Field rules ({"field", "below"|...}) and history rules ({"new_low"|...})
+    rules: Tuple[Dict, ...]
+    history_rules: Tuple[Dict, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """The whole of config.json."""
+    email: Optional[EmailSettings]
+    items: Tuple[TrackedItem, ...]
+    listing_sources: Tuple[Dict, ...]
+    schedule: Dict
+    scraper: Dict
+    parsing: Dict
+    sharding: Dict
+    logging: Dict
+    status: Dict
+
+
+class _Checker:
+    """Collects validation errors, each prefixed with where it was found."""
+
+    def __init__(self):
+        self.errors: List[str] = []
+
+    def error(self, where: str, message: str):
+        self.errors.append(f"{where}: {message}")
+
+    def get(self, data: Dict, name: str, where: str, kind: str,
+            default: Any = None, required: bool = False) -> Any:
+        """
+        Return data[name] checked against 'kind', or the default.
+
+        'kind' is "str", "number", "bool", "int", "object", "list" or
+        "key" (a string or a number, returned as a string).
+        """
+        if name not in data or data[name] is None:
+            if required:
+                self.error(f"{where}.{name}", "is required")
+            return default
+
+        value = data[name]
+        if kind == 'str' and isinstance(value, str):
+            return value
+        if kind == 'key' and isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            return str(value)
+        if kind == 'number' and isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+        if kind == 'int' and isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if kind == 'bool' and isinstance(value, bool):
+            return value
+        if kind == 'object' and isinstance(value, dict):
+            return value
+        if kind == 'list' and isinstance(value, list):
+            return value
+
+        expected = {'str': 'a string', 'key': 'a string or number', 'number': 'a number',
+                    'int': 'an integer', 'bool': 'true or false', 'object': 'an object',
+                    'list': 'a list'}[kind]
+        self.error(f"{where}.{name}", f"expected {expected}, got {json.dumps(value)}")
+        return default
+
+
+def _email(check: _Checker, data: Dict) -> EmailSettings:
+    where = 'email'
+    return EmailSettings(
+        smtp_server=check.get(data, 'smtp_server', where, 'str', required=True),
+        smtp_port=check.get(data, 'smtp_port', where, 'int', required=True),
+        sender_email=check.get(data, 'sender_email', where, 'str', required=True),
+        sender_password=check.get(data, 'sender_password', where, 'str', required=True),
+        recipient_email=check.get(data, 'recipient_email', where, 'str', required=True),
+        use_tls=check.get(data, 'use_tls', where, 'bool', True),
+    )
+
+
+def _fields(check: _Checker, data: Dict, where: str) -> Dict[str, Dict]:
+    """Check a 'fields' object and return it normalised (see scraper.normalize_fields)."""
+    fields = check.get(data, 'fields', where, 'object', {})
+    valid = {}
+    for name, spec in fields.items():
+        spec_where = f"{where}.fields.{name}"
+        if isinstance(spec, dict):
+            if not isinstance(spec.get('selector'), str):
+                check.error(spec_where, 'needs a "selector" string')
+                continue
+            if spec.get('type', 'number') not in ('number', 'text'):
+                check.error(spec_where, f'type must be "number" or "text", got {json.dumps(spec["type"])}')
+                continue
+        elif not isinstance(spec, str):
+            check.error(spec_where, f"expected a selector or an object, got {json.dumps(spec)}")
+            continue
+        valid[name] = spec
+    return normalize_fields(valid)
+
+
+def _rules(check: _Checker, data: Dict, where: str,
+           parameter: str) -> Tuple[Tuple[Dict, ...], Tuple[Dict, ...]]:
+    """Split an item's 'alerts' into field rules and history rules."""
+    rules, history_rules = [], []
+    for index, rule in enumerate(check.get(data, 'alerts', where, 'list', [])):
+        rule_where = f"{where}.alerts[{index}]"
+        if not isinstance(rule, dict):
+            check.error(rule_where, f"expected an object, got {json.dumps(rule)}")
+            continue
+
+        field = check.get(rule, 'field', rule_where, 'str', parameter)
+        history = [name for name in HISTORY_RULES if name in rule]
+        if history:
+            if field != parameter:
+                check.error(rule_where, f"{history[0]} only applies to the tracked parameter '{parameter}'")
+                continue
+            for name in history + ['days', 'recent_hours']:
+                check.get(rule, name, rule_where, 'number')
+            history_rules.append(rule)
+        elif any(name in rule for name in FIELD_RULES):
+            for name in ('below', 'above'):
+                check.get(rule, name, rule_where, 'number')
+            rules.append(rule)
+        else:
+            check.error(rule_where, f"needs one of: {', '.join(FIELD_RULES + HISTORY_RULES)}")
+    return tuple(rules), tuple(history_rules)
+
+
+def _item(check: _Checker, data: Dict, where: str) -> Optional[TrackedItem]:
+    name = check.get(data, 'name', where, 'str', required=True)
+    if name:
+        where = f"{where} ({name})"
+    url = check.get(data, 'url', where, 'str', required=True)
+    if url and not url.startswith(('http://', 'https://')):
+        check.error(f"{where}.url", f"must start with http:// or https://, got {json.dumps(url)}")
+        url = None
+
+    parameter = check.get(data, 'parameter', where, 'str', 'price')
+    currency = check.get(data, 'currency', where, 'str', '')
+    weight = check.get(data, 'weight', where, 'number', 1.0)
+    if weight < 0:
+        check.error(f"{where}.weight", "must not be negative")
+
+    fields = _fields(check, data, where)
+    if parameter not in fields:
+        selector = check.get(data, 'css_selector', where, 'str', '.price')
+        fields[parameter] = {'selector': selector, 'type': 'number'}
+
+    # Number fields are read in the item's 'locale', else as its 'currency' suggests
+    locale = resolve_locale(check.get(data, 'locale', where, 'str'), currency)
+    for spec in fields.values():
+        if spec['type'] == 'number':
+            spec.setdefault('locale', locale)
+
+    # Only the tracked parameter searches script tags when selectors miss
+    fields[parameter]['script_fallback'] = fields[parameter]['type'] == 'number'
+
+    rules, history_rules = _rules(check, data, where, parameter)
+    threshold = check.get(data, 'threshold', where, 'number')
+    if threshold is not None and fields[parameter]['type'] == 'text':
+        check.error(f"{where}.threshold", f"cannot apply to the text field '{parameter}'; use an alert rule")
+        threshold = None
+    enabled = check.get(data, 'enabled', where, 'bool', True)
+    render = check.get(data, 'render', where, 'bool', False)
+    sku = check.get(data, 'sku', where, 'key')
+    item_id = check.get(data, 'id', where, 'key')
+
+    if name is None or url is None:
+        return None
+
+    return TrackedItem(
+        name=name,
+        url=url,
+        key=item_id or name,
+        page_url=normalize_url(url),
+        host=urlparse(url).netloc,
+        parameter=parameter,
+        threshold=threshold,
+        currency=currency,
+        enabled=enabled,
+        render=render,
+        sku=sku,
+        weight=weight,
+        fields=fields,
+        rules=rules,
+        history_rules=history_rules,
+    )
+
+
+def _listing_source(check: _Checker, data: Dict, where: str) -> Dict:
+    """Check a listing source; returns a copy with its normalised 'page_url' added."""
+    url = check.get(data, 'url', where, 'str', required=True)
+    check.get(data, 'row_selector', where, 'str', required=True)
+    for name in ('name', 'link_selector', 'sku_selector', 'sku_attribute', 'price_selector',
+                 'locale', 'currency'):
+        check.get(data, name, where, 'str')
+    for name in ('render', 'enabled'):
+        check.get(data, name, where, 'bool')
+    _fields(check, data, where)
+    return dict(data, page_url=normalize_url(url) if url else None)
+
+
+def _scraper(check: _Checker, data: Dict):
+    where = 'scraper'
+    for name in ('stream', 'pool_block', 'http2'):
+        check.get(data, name, where, 'bool')
+    for name in ('max_body_bytes', 'pool_connections', 'pool_maxsize'):
+        if check.get(data, name, where, 'int', 1) < 1:
+            check.error(f"{where}.{name}", "must be at least 1")
+    host_pools = check.get(data, 'host_pools', where, 'object', {})
+    for host in host_pools:
+        if check.get(host_pools, host, f"{where}.host_pools", 'int', 1) < 1:
+            check.error(f"{where}.host_pools.{host}", "must be at least 1")
+
+    renderer = check.get(data, 'renderer', where, 'object')
+    if renderer is not None:
+        for name in ('contexts', 'max_pages'):
+            if check.get(renderer, name, f"{where}.renderer", 'int', 1) < 1:
+                check.error(f"{where}.renderer.{name}", "must be at least 1")
+        check.get(renderer, 'timeout', f"{where}.renderer", 'number')
+        check.get(renderer, 'wait_until', f"{where}.renderer", 'str')
+        for name in ('block_resources', 'block_hosts'):
+            check.get(renderer, name, f"{where}.renderer", 'list')
+
+    proxies = check.get(data, 'proxies', where, 'object')
+    if proxies is None:
+        return
+    where = 'scraper.proxies'
+    for index, url in enumerate(check.get(proxies, 'urls', where, 'list', [])):
+        if not isinstance(url, str) or not url.startswith(('http://', 'https://', 'socks5://', 'socks5h://')):
+            check.error(f"{where}.urls[{index}]", f"expected a proxy URL, got {json.dumps(url)}")
+    check.get(proxies, 'direct', where, 'bool')
+    check.get(proxies, 'evict_seconds', where, 'number')
+    check.get(proxies, 'max_failures', where, 'int')
+
+
+def _schedule(check: _Checker, data: Dict):
+    where = 'schedule'
+    cron = check.get(data, 'cron', where, 'str')
+    if cron is not None and not croniter.is_valid(cron):
+        check.error(f"{where}.cron", f"invalid cron expression {json.dumps(cron)}")
+    for name in ('enabled', 'run_on_startup'):
+        check.get(data, name, where, 'bool')
+    for name in ('timezone', 'description'):
+        check.get(data, name, where, 'str')
+    check.get(data, 'fresh_seconds', where, 'number')
+    if data.get('max_run_seconds') != 'auto':
+        check.get(data, 'max_run_seconds', where, 'number')
+
+
+def _parsing(check: _Checker, data: Dict):
+    where = 'parsing'
+    if check.get(data, 'processes', where, 'int', 0) < 0:
+        check.error(f"{where}.processes", "must not be negative")
+    if check.get(data, 'max_tasks_per_child', where, 'int', 1) < 1:
+        check.error(f"{where}.max_tasks_per_child", "must be at least 1")
+
+
+def _sharding(check: _Checker, data: Dict):
+    where = 'sharding'
+    index = check.get(data, 'index', where, 'int', 0)
+    count = check.get(data, 'count', where, 'int', 1)
+    if count < 1:
+        check.error(f"{where}.count", "must be at least 1")
+    elif not 0 <= index < count and 'count' in data:
+        check.error(f"{where}.index", f"must be between 0 and {count - 1}")
+    check.get(data, 'lock_dir', where, 'str')
+    check.get(data, 'instance_id', where, 'key')
+    for name in ('ttl_seconds', 'claim_seconds'):
+        check.get(data, name, where, 'number')
+
+
+def _logging(check: _Checker, data: Dict):
+    where = 'logging'
+    for name in ('max_bytes', 'backup_count'):
+        if check.get(data, name, where, 'int', 0) < 0:
+            check.error(f"{where}.{name}", "must not be negative")
+    check.get(data, 'when', where, 'str')
+    for name in ('compress', 'json'):
+        check.get(data, name, where, 'bool')
+
+
+def _status(check: _Checker, data: Dict):
+    where = 'status'
+    check.get(data, 'enabled', where, 'bool')
+    check.get(data, 'host', where, 'str')
+    if not 0 <= check.get(data, 'port', where, 'int', 0) <= 65535:
+        check.error(f"{where}.port", "must be between 0 and 65535")
+    if check.get(data, 'trend_window', where, 'int', 1) < 1:
+        check.error(f"{where}.trend_window", "must be at least 1")
+
+
+def parse_settings(config: Dict) -> Settings:
+    """Validate a loaded config.json and build its settings; raises ConfigError."""
+    check = _Checker()
+    if not isinstance(config, dict):
+        raise ConfigError("the configuration must be a JSON object")
+
+    email_data = check.get(config, 'email', 'config', 'object')
+    email = _email(check, email_data) if email_data is not None else None
+
+    sections = {name: check.get(config, name, 'config', 'object', {}) for name in SECTIONS}
+    _schedule(check, sections['schedule'])
+    _scraper(check, sections['scraper'])
+    _parsing(check, sections['parsing'])
+    _sharding(check, sections['sharding'])
+    _logging(check, sections['logging'])
+    _status(check, sections['status'])
+
+    items = []
+    for index, data in enumerate(check.get(config, 'tracked_items', 'config', 'list', [])):
+        where = f"tracked_items[{index}]"
+        if not isinstance(data, dict):
+            check.error(where, f"expected an object, got {json.dumps(data)}")
+            continue
+        item = _item(check, data, where)
+        if item is not None:
+            items.append(item)
+
+    sources = []
+    for index, data in enumerate(check.get(config, 'listing_sources', 'config', 'list', [])):
+        where = f"listing_sources[{index}]"
+        if not isinstance(data, dict):
+            check.error(where, f"expected an object, got {json.dumps(data)}")
+            continue
+        sources.append(_listing_source(check, data, where))
+
+    if check.errors:
+        raise ConfigError(
+            f"{len(check.errors)} problem(s) found:\n" + '\n'.join(f"  - {e}" for e in check.errors)
+        )
+
+    seen: Dict[str, str] = {}
+    for item in items:
+        if item.key in seen:
+            logging.warning(
+                f"Tracked items '{seen[item.key]}' and '{item.name}' share the history key "
+                f"'{item.key}'; give one of them an 'id'"
+            )
+        seen.setdefault(item.key, item.name)
+
+    return Settings(
+        email=email,
+        items=tuple(items),
+        listing_sources=tuple(sources),
+        **sections,
+    )
+
+
+# Settings of the last load and the file state they were built from
+_settings: Optional[Settings] = None
+_settings_stamp: Optional[Tuple] = None
+
+
+def load_settings(path: Path = CONFIG_FILE) -> Settings:
+    """
+    Return the validated settings of config.json.
+
+    The result is reused until the file's size or modification time
+    changes, so the scheduler picks up edits without paying for a full
+    parse on every run.
+    """
+    global _settings, _settings_stamp
+
+    if not path.exists():
+        raise FileNotFoundError(
+            f"Configuration file not found: {path}\n"
+            f"Please create config.json based on config.example.json"
+        )
+
+    stat = os.stat(path)
+    stamp = (str(path), stat.st_mtime_ns, stat.st_size)
+    if _settings is not None and stamp == _settings_stamp:
+        return _settings
+
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    _settings = parse_settings(config)
+    _settings_stamp = stamp
+    return _settings
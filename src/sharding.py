@@ -0,0 +1,225 @@
+"""
+Sharded multi-instance mode for SaleNotificator.
+
+Several scheduler containers can split the tracked items between them.
+Every page (product URL or listing URL) is assigned to one instance with a
+consistent-hash ring, so when instances join or leave only their share of
+pages moves.
+
+Instances are known either statically (shard index/count, e.g. from the
+SHARD_INDEX / SHARD_COUNT environment variables) or dynamically through a
+shared lock directory: every instance keeps a heartbeat file there, and
+the live heartbeats form the ring. In lock-directory mode each page is also
+claimed before it is fetched, so two instances that briefly disagree about
+membership never fetch (or alert on) the same page twice.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def _hash(value: str) -> int:
+    """Stable 64-bit hash, identical in every process and container."""
+    return int.from_bytes(hashlib.md5(value.encode('utf-8')).digest()[:8], 'big')
+
+
+class HashRing:
+    """Consistent-hash ring with virtual nodes."""
+
+    def __init__(self, members: List[str], replicas: int = 100):
+        self.members = sorted(members)
+        points = sorted(
+            (_hash(f"{member}#{replica}"), member)
+            for member in self.members
+            for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [member for _, member in points]
+
+    def owner(self, key: str) -> Optional[str]:
+        """Return the member that owns a key."""
+        if not self._hashes:
+            return None
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+
+class ShardCoordinator:
+    """Decides which pages this instance is responsible for."""
+
+    def __init__(self, instance_id: str, shard_count: Optional[int] = None,
+                 lock_dir: Optional[Path] = None, ttl_seconds: int = 300,
+                 claim_seconds: int = 900):
+        self.instance_id = instance_id
+        self.shard_count = shard_count
+        self.lock_dir = lock_dir
+        self.ttl_seconds = ttl_seconds
+        self.claim_seconds = claim_seconds
+        self.ring = HashRing([instance_id])
+
+        if self.lock_dir is not None:
+            (self.lock_dir / 'members').mkdir(parents=True, exist_ok=True)
+            (self.lock_dir / 'claims').mkdir(parents=True, exist_ok=True)
+
+    def _write_json(self, path: Path, data: Dict):
+        """Atomically replace a small JSON file."""
+        tmp = path.with_name(f".{path.name}.{self.instance_id}.tmp")
+        tmp.write_text(json.dumps(data), encoding='utf-8')
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _read_json(path: Path) -> Optional[Dict]:
+        """Read a small JSON object; None when it is missing or unreadable."""
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def heartbeat(self):
+        """Announce this instance as alive (lock-directory mode only)."""
+        if self.lock_dir is not None:
+            self._write_json(
+                self.lock_dir / 'members' / f"{self.instance_id}.json",
+                {'instance_id': self.instance_id, 'seen_at': time.time()}
+            )
+
+    def leave(self):
+        """Remove this instance from the ring, e.g. on shutdown."""
+        if self.lock_dir is not None:
+            try:
+                (self.lock_dir / 'members' / f"{self.instance_id}.json").unlink()
+            except FileNotFoundError:
+                pass
+
+    def refresh(self) -> List[str]:
+        """Rebuild the ring from the current membership and return the members."""
+        if self.lock_dir is None:
+            members = [str(index) for index in range(self.shard_count)]
+        else:
+            self.heartbeat()
+            cutoff = time.time() - self.ttl_seconds
+            members = []
+            for path in (self.lock_dir / 'members').glob('*.json'):
+                try:
+                    data = json.loads(path.read_text(encoding='utf-8'))
+                except (OSError, ValueError):
+                    continue
+                if data.get('seen_at', 0) >= cutoff:
+                    members.append(data['instance_id'])
+
+        self.ring = HashRing(members)
+        return self.ring.members
+
+    def owns(self, key: str) -> bool:
+        """Whether this instance owns a page key on the current ring."""
+        return self.ring.owner(key) == self.instance_id
+
+    def claim(self, key: str) -> bool:
+        """
+        Claim a page for this run.
+
+        Always succeeds in static mode. In lock-directory mode it fails
+        while another instance holds an unexpired claim on the same page.
+
+        A new claim file is linked into place, which fails if the file
+        already exists, so of several instances claiming a free page only
+        one succeeds. An expired claim (or this instance's own) is replaced
+        and read back, and the claim is only held if the file still names
+        this instance's claim.
+        """
+        if self.lock_dir is None:
+            return True
+
+        path = self.lock_dir / 'claims' / f"{_hash(key):016x}.json"
+        now = time.time()
+        claim = {
+            'instance_id': self.instance_id,
+            'key': key,
+            'expires_at': now + self.claim_seconds
+        }
+        tmp = path.with_name(f".{path.name}.{self.instance_id}.tmp")
+        tmp.write_text(json.dumps(claim), encoding='utf-8')
+        try:
+            try:
+                os.link(tmp, path)
+                return True
+            except FileExistsError:
+                pass
+
+            held = self._read_json(path)
+            if (held is not None and held.get('instance_id') != self.instance_id
+                    and held.get('expires_at', 0) > now):
+                return False
+
+            os.replace(tmp, path)
+            return self._read_json(path) == claim
+        finally:
+            try:
+                tmp.unlink()
+            except FileNotFoundError:
+                pass
+
+
+# Coordinator shared by the checker and the scheduler loop
+_coordinator: Optional[ShardCoordinator] = None
+_coordinator_settings: Optional[Dict] = None
+
+
+def get_coordinator(sharding_config: Dict) -> Optional[ShardCoordinator]:
+    """
+    Return the shard coordinator, or None when sharding is off.
+
+    SHARD_INDEX / SHARD_COUNT / SHARD_ID / SHARD_LOCK_DIR environment
+    variables override the 'sharding' config section, so one config file
+    can serve every container.
+    """
+    global _coordinator, _coordinator_settings
+
+    settings = dict(sharding_config)
+    for key, env in (('index', 'SHARD_INDEX'), ('count', 'SHARD_COUNT'),
+                     ('instance_id', 'SHARD_ID'), ('lock_dir', 'SHARD_LOCK_DIR')):
+        if os.environ.get(env):
+            settings[key] = os.environ[env]
+
+    if settings == _coordinator_settings:
+        return _coordinator
+
+    if _coordinator is not None:
+        _coordinator.leave()
+    _coordinator = None
+
+    if settings.get('lock_dir'):
+        _coordinator = ShardCoordinator(
+            instance_id=str(settings.get('instance_id') or socket.gethostname()),
+            lock_dir=Path(settings['lock_dir']),
+            ttl_seconds=int(settings.get('ttl_seconds', 300)),
+            claim_seconds=int(settings.get('claim_seconds', 900))
+        )
+    elif int(settings.get('count', 1)) > 1:
+        count = int(settings['count'])
+        index = int(settings.get('index', 0))
+        if not 0 <= index < count:
+            raise ValueError(f"Shard index {index} is outside 0..{count - 1}")
+        _coordinator = ShardCoordinator(instance_id=str(index), shard_count=count)
+
+    _coordinator_settings = settings
+    return _coordinator
+
+
+def heartbeat():
+    """Refresh the heartbeat of the active coordinator, if any."""
+    if _coordinator is not None:
+        _coordinator.heartbeat()
+
+
+def shutdown():
+    """Leave the ring so the remaining instances take over immediately."""
+    if _coordinator is not None:
+        _coordinator.leave()
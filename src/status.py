@@ -0,0 +1,266 @@
+"""
+Local status API for SaleNotificator.
+
+The scheduler daemon keeps the latest result of every tracked item in
+memory, warmed from the price history at startup and updated as each item
+is checked, and serves it as JSON over a small local HTTP server:
+
+    GET /status          all items
+    GET /status/<id>     one item (its 'id', or else its name)
+    GET /health          liveness check
+
+Reads are answered from memory (the full listing is serialised once per
+change), so asking "what's the price now?" never touches a retailer.
+
+Run this module to check that every kind of item renders:
+
+    python src/status.py
+"""
+
+import json
+import logging
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+from history import ItemSummary, PriceHistory
+from settings import TrackedItem
+
+
+def _timestamp(value: Optional[float]) -> Optional[str]:
+    """Format a Unix time for JSON output."""
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value).isoformat(timespec='seconds')
+
+
+def _trend(values: List[float]) -> Dict:
+    """Summarise the direction of the recent values."""
+    # Checks of text fields have no number to compare
+    values = [value for value in values if value is not None]
+    if len(values) < 2:
+        return {'direction': 'flat', 'change': 0.0, 'change_percent': 0.0, 'samples': values}
+    change = values[-1] - values[0]
+    return {
+        'direction': 'down' if change < 0 else 'up' if change > 0 else 'flat',
+        'change': round(change, 2),
+        'change_percent': round(change / values[0] * 100, 2) if values[0] else 0.0,
+        'samples': values,
+    }
+
+
+class StatusTable:
+    """Latest result per item, safe to read and update from any thread."""
+
+    def __init__(self, window: int = 10):
+        self.window = window
+        self._lock = threading.Lock()
+        self._items: Dict[str, Dict] = {}
+        self._next_check: Optional[datetime] = None
+        # Serialised /status response, rebuilt lazily after a change
+        self._body: Optional[bytes] = None
+
+    def load(self, items: List[TrackedItem], summaries: Dict[str, ItemSummary]):
+        """Fill the table from tracked items and their history."""
+        with self._lock:
+            for item in items:
+                key = item.key
+                summary = summaries.get(key, ItemSummary())
+                self._items[key] = self._entry(item)
+                self._items[key].update({
+                    'last_value': summary.last_value,
+                    'last_check': summary.last_check,
+                    'last_success': summary.last_success,
+                    'recent': [
+                        value for value in summary.recent_values[-self.window:] if value is not None
+                    ],
+                })
+            self._body = None
+
+    def _entry(self, item: TrackedItem) -> Dict:
+        return {
+            'id': item.key,
+            'name': item.name,
+            'url': item.url,
+            'parameter': item.parameter,
+            'threshold': item.threshold,
+            'currency': item.currency,
+            'last_value': None,
+            'last_check': None,
+            'last_success': None,
+            'last_outcome': None,
+            'recent': [],
+        }
+
+    def update(self, item: TrackedItem, value: Optional[float], ok: bool, outcome: str,
+               checked_at: float):
+        """Record the result of one check."""
+        key = item.key
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                entry = self._items[key] = self._entry(item)
+            entry['last_check'] = checked_at
+            entry['last_outcome'] = outcome
+            if ok:
+                entry['last_success'] = checked_at
+            if value is not None:
+                entry['last_value'] = value
+                entry['recent'] = (entry['recent'] + [value])[-self.window:]
+            self._body = None
+
+    def set_next_check(self, when: datetime):
+        """Record when the scheduler runs next."""
+        with self._lock:
+            self._next_check = when
+            self._body = None
+
+    def _render(self, entry: Dict) -> Dict:
+        data = {name: value for name, value in entry.items() if name != 'recent'}
+        for name in ('last_check', 'last_success'):
+            data[name] = _timestamp(entry[name])
+        data['next_check'] = self._next_check.isoformat(timespec='seconds') if self._next_check else None
+        data['trend'] = _trend(entry['recent'])
+        return data
+
+    def body(self) -> bytes:
+        """JSON body of GET /status."""
+        with self._lock:
+            if self._body is None:
+                self._body = json.dumps({
+                    'next_check': self._next_check.isoformat(timespec='seconds') if self._next_check else None,
+                    'items': [self._render(entry) for entry in self._items.values()],
+                }).encode('utf-8')
+            return self._body
+
+    def item_body(self, key: str) -> Optional[bytes]:
+        """JSON body of GET /status/<key>, or None for an unknown item."""
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            return json.dumps(self._render(entry)).encode('utf-8')
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """Serve the status table; any other path is a 404."""
+
+    def do_GET(self):
+        table: StatusTable = self.server.table
+        path = urlparse(self.path).path.rstrip('/')
+
+        if path in ('', '/status'):
+            self._send(200, table.body())
+        elif path.startswith('/status/'):
+            body = table.item_body(unquote(path[len('/status/'):]))
+            if body is None:
+                self._send(404, b'{"error": "unknown item"}')
+            else:
+                self._send(200, body)
+        elif path == '/health':
+            self._send(200, b'{"status": "ok"}')
+        else:
+            self._send(404, b'{"error": "not found"}')
+
+    def _send(self, code: int, body: bytes):
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Status reads are not worth a log line each
+        pass
+
+
+# Table and server of the running daemon, if any
+_table: Optional[StatusTable] = None
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def start(status_config: Dict, items: List[TrackedItem], history: PriceHistory) -> Optional[StatusTable]:
+    """
+    Warm the status table from history and start serving it.
+
+    Returns None when disabled with 'status.enabled': false. If the port
+    cannot be bound the table is still kept, just not served.
+    """
+    global _table, _server
+
+    if not status_config.get('enabled', True):
+        return None
+
+    _table = StatusTable(window=status_config.get('trend_window', 10))
+    _table.load(items, history.summaries(
+        (item.key for item in items), window=_table.window
+    ))
+
+    host = status_config.get('host', '127.0.0.1')
+    port = status_config.get('port', 8765)
+    try:
+        _server = ThreadingHTTPServer((host, port), StatusHandler)
+    except OSError as e:
+        logging.warning(f"Status API unavailable on {host}:{port}: {e}")
+        return _table
+
+    _server.daemon_threads = True
+    _server.table = _table
+    threading.Thread(target=_server.serve_forever, name='status-api', daemon=True).start()
+    logging.info(f"Status API listening on http://{host}:{_server.server_address[1]}/status")
+    return _table
+
+
+def record_check(item: TrackedItem, value: Optional[float], ok: bool, outcome: str,
+                 checked_at: float):
+    """Update the running daemon's status table, if any."""
+    if _table is not None:
+        _table.update(item, value, ok, outcome, checked_at)
+
+
+def set_next_check(when: datetime):
+    """Publish the scheduler's next run time, if the status table is active."""
+    if _table is not None:
+        _table.set_next_check(when)
+
+
+def stop():
+    """Stop serving the status API."""
+    global _server
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
+
+
+def _self_check():
+    """Render a price item and a text-field item, as the API would."""
+    from settings import parse_settings
+
+    items = parse_settings({'tracked_items': [
+        {'name': 'Case', 'url': 'https://example.com/case', 'threshold': 100},
+        {'name': 'Stock', 'url': 'https://example.com/stock', 'parameter': 'stock',
+         'fields': {'stock': {'selector': '.stock', 'type': 'text'}}},
+    ]}).items
+
+    table = StatusTable()
+    table.load(items, {
+        'Case': ItemSummary(last_value=99.0, last_success=0.0, recent_values=[105.0, 99.0]),
+        # As loaded from an older history, before text checks were filtered out
+        'Stock': ItemSummary(last_success=0.0, recent_values=[None, None]),
+    })
+    for item, value in zip(items, (98.0, None)):
+        for _ in range(2):
+            table.update(item, value, True, 'ok', 0.0)
+
+    listing = json.loads(table.body())
+    assert [entry['trend']['direction'] for entry in listing['items']] == ['down', 'flat'], listing
+    for item in items:
+        json.loads(table.item_body(item.key))
+    print("ok: /status renders price and text-field items")
+
+
+if __name__ == '__main__':
+    _self_check()